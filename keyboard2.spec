@@ -4,8 +4,8 @@ a = Analysis(
     ['src\\keyboard2.py'],
     pathex=[os.path.abspath('src')],
     binaries=[],
-    datas=[('_internal/dialogue.ui', '_internal'), ('try_icon.png', '.')],
-    hiddenimports=['dotenv', 'customtextedit'],
+    datas=[('try_icon.png', '.')],
+    hiddenimports=['dotenv'],
     hookspath=['.'],
     hooksconfig={},
     runtime_hooks=[],
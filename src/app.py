@@ -7,6 +7,12 @@
 глобальные и одиночные горячие клавиши.
 Следит, чтобы приложение существовало в одном экземпляре.
 
+Повторный запуск
+----------------
+Проверка единственности экземпляра выполняется до создания ``QApplication``:
+повторно запущенная копия сообщает о себе системным ``MessageBoxW`` и завершается,
+не загружая плагины и шрифты Qt.
+
 Ключевые элементы
 -----------------
 - :class:`StartApp` — объединяет инициализацию Qt, UI, контроллера, трея,
@@ -16,7 +22,7 @@
 -----------
 - PyQt6
 - Внутренние модули: ``src.constants``, ``src.system_tray``, ``src.single_instance``,
-  ``src.UI.main_window``, ``src.controller``, ``src.hotkey_win``.
+  ``src.UI.main_window``, ``src.controller``.
 
 Примечание по завершению
 ------------------------
@@ -27,6 +33,8 @@
 
 from __future__ import annotations
 
+import ctypes
+from ctypes import wintypes
 import sys
 import logging
 
@@ -36,15 +44,24 @@ logger = logging.getLogger(__name__)
 
 from PyQt6 import QtWidgets
 
-import src.functions as f
 from src.system_tray import Tray
 from src.single_instance import SingleInstance
 from src.main_window import MainWindow
-from src.windows_hotkeys import HotkeyFilter
 from src.controller import Controller
 from src.try_log import log_exceptions
 from src.constants import C
 
+user32 = ctypes.WinDLL("user32", use_last_error=True)
+user32.MessageBoxW.argtypes = [
+    wintypes.HWND,
+    wintypes.LPCWSTR,
+    wintypes.LPCWSTR,
+    wintypes.UINT,
+]
+user32.MessageBoxW.restype = ctypes.c_int
+
+MB_ICONWARNING = 0x30
+
 
 class StartApp(QObject):
     """жизненный цикл приложения.
@@ -63,14 +80,13 @@ class StartApp(QObject):
         """
         super().__init__()
 
-        self.app = self.create_app()
-        self.single = SingleInstance()
+        # Проверка до создания QApplication: повторный запуск не платит за загрузку Qt
+        self.single = SingleInstance()  # Дескриптор мьютекса живёт до cleanup
         if not self.can_we_continue():
             raise SystemExit(1)
+        self.app = self.create_app()
         self.ui = MainWindow()
         self.control = Controller()
-        self.hk_filter = HotkeyFilter(self.control.on_hotkey)
-        self.app.installNativeEventFilter(self.hk_filter)
 
     @log_exceptions
     def main_app(self) -> int:
@@ -108,11 +124,11 @@ class StartApp(QObject):
 
         # единственный экземпляр
         if self.single.already_running():
-            f.show_message(  # Сообщение о том, что программа уже загружена
-                C.TEXT_MESSAGE_NO_START_PROGRAM,
-                C.TIME_MESSAGE_NO_START_PROGRAM,
-                C.COLOR_MESSAGE_NO_START_PROGRAM,
+            # Сообщение о том, что программа уже загружена. Qt ещё не создан
+            user32.MessageBoxW(
+                None, C.TEXT_MESSAGE_NO_START_PROGRAM, C.TITLE_WARNING, MB_ICONWARNING
             )
+            self.single.cleanup()
             return False
         return True
 
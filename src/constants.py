@@ -54,6 +54,7 @@ class _Const:
     # --- Ротация файла
     ROTATING_MAX_BYTES: int = 10_000
     ROTATING_BACKUP_COUNT: int = 5
+    FILE_LOG_BUFFER_SIZE: int = 64 * 1024  # Буфер файла журнала (байт)
 
     # --- Преобразование строкового уровня в код logging
     CONVERT_LOGGING_NAME_TO_CODE: dict[str, int] = {
@@ -79,25 +80,29 @@ class _Const:
     )
 
     # --- Сообщение о неудачной загрузке программы
-    COLOR_MESSAGE_NO_START_PROGRAM = QColor("red")
     TEXT_MESSAGE_NO_START_PROGRAM = (
         "Программа работы с клавиатурой уже запущена.\nПовторный запуск не нужен."
     )
-    TIME_MESSAGE_NO_START_PROGRAM = (
-        2.0  # Время высвечивания сообщения о запуске программы (в секундах)
-    )
 
     # --- Сообщения логирования
     LOGGER_TEXT_CHANGE = "Заменённый текст *{text}*"
+    LOGGER_TEXT_HOOK_REINSTALL = (
+        "LowLevelHookWatchDog: события клавиатуры не доходят до хука клавиатуры, "
+        "хук переустановлен"
+    )
+    LOGGER_TEXT_NO_HOOK_WATCHDOG = (
+        "LowLevelHookWatchDog: проверка хука клавиатуры отключена, "
+        "не удалось подписаться на Raw Input\n{e}"
+    )
     LOGGER_TEXT_ERROR_KEYBOARD = "Система отклонила автоматический ввод текста\n{e}"
     LOGGER_TEXT_ERROR_READ_CLIPBOARD = "Из Clipboard считан пустой текст"
     LOGGER_TEXT_LOAD_PROGRAM = "Программа загружена"
     LOGGER_TEXT_NO_IN_CLIPBOARD = (
-        "Текст не выделен или не попал в буфер обмена. Время ожидания - {time_delay}"
+        "Текст не выделен или не попал в буфер обмена. Время ожидания - %s"
     )
     LOGGER_TEXT_ORIGINAL = "Текст пользователя *{text}*"
     LOGGER_TEXT_RESTORED_CLIPBOARD = "Текст +*{clipboard_text}*+ возвращён буфер обмена"
-    LOGGER_TEXT_START_DIALOGUE = "Начало диалога. Окно - {title}"
+    LOGGER_TEXT_START_DIALOGUE = "Начало диалога. Окно - %s"
     LOGGER_TEXT_STOP_DIALOGUE = "Диалог завершён"
     LOGGER_TEXT_UNCAUGHT = "Не перехваченное исключение"
     LOGGER_TEXT_UNKNOWN = "Необработанное исключение {e}"
@@ -110,8 +115,16 @@ class _Const:
         100  # Задержка, в мили секундах, после нажатия Ctrl+c или Ctrl+v
     )
 
-    # --- Пути программ
-    UI_PATH_FROM_EXE = r"_internal\dialogue.ui"
+    # --- Диалог замены текста
+    TIME_DELAY_CHANGE_TEXT = (
+        30  # Пауза в правках (мс), после которой пересчитывается вариант замены
+    )
+
+    # --- Низкоуровневый хук клавиатуры
+    TIME_HOOK_WATCHDOG = 5000  # Период проверки, что хук не снят Windows (мс)
+    # Столько проверок подряд хук должен пропустить новые события клавиатуры,
+    # чтобы его переустановить: одиночный пропуск бывает и у живого хука
+    HOOK_MISSED_CHECKS = 3
 
     # --- Настройки кнопок
     MIN_WIDTH_BUTTON = 170  # Минимальная ширина первых двух кнопок
@@ -131,7 +144,7 @@ class _Const:
         "Не предусмотренная программой команда закрытия диалога command={command}"
     )
     TEXT_ERROR_CHANGE_KEYBOARD = "Ошибка при изменении регистра клавиатуры"
-    TEXT_ERROR_CHANGE_TEXT = "Ошибка при работе с текстом пользователя. {e}"
+    TEXT_ERROR_CHANGE_TEXT = "Ошибка при работе с текстом пользователя"
     TEXT_ERROR_CLOSE_HANDLER = "Не удалось закрыть чужой обработчик лога {name}"
     TEXT_ERROR_CONNECT_BUTTON = (
         "Ошибка при назначении обработчиков кнопкам или другим объектам {e}"
@@ -144,16 +157,15 @@ class _Const:
     TEXT_ERROR_EXIT = "Ошибка при выходе из приложения. {e}"
     TEXT_ERROR_GET_VAR_1 = "Метод get_var класса Variables.\nПервый параметр {name} имеет тип отличный от str"
     TEXT_ERROR_GET_VAR_2 = "Метод get_var класса Variables.\nВторой параметр {default} имеет тип отличный от str"
-    TEXT_ERROR_LOAD_UI = (
-        "Ошибка загрузки UI (Описаний окна, подготовленных QtDesigner) {ui_path}"
-    )
+    TEXT_ERROR_LOAD_UI = "Ошибка загрузки UI (Описаний окна, подготовленных QtDesigner)"
     TEXT_ERROR_LOG_LEVEL_NAME = "Некорректное значение уровня"
     TEXT_ERROR_ON_NO = "Ошибка в диалоговом окне при нажатии на кнопку NO"
     TEXT_ERROR_ORIGINAL_TEXT = "Ошибка отображения выделенного текста {e}"
     TEXT_ERROR_PROCESSING_CLIPBOARD = " Ошибка при чтении из буфера обмена. {e}"
     TEXT_ERROR_REPLACE_TEXT = "Ошибка при формировании/записи заменяющего текста"
+    TEXT_ERROR_RESTORE_CLIPBOARD = "Ошибка при восстановлении буфера обмена"
     TEXT_ERROR_RUN_CALCULATOR = "Не удалось запустить {calculator}: {e}"
-    TEXT_ERROR_SCROLL = "Ошибка при вызове окна диалога. {e}"
+    TEXT_ERROR_SCROLL = "Ошибка при вызове окна диалога"
     TEXT_ERROR_SEND_EMAIL = "Ошибка при выводе адреса e-mail"
     TEXT_ERROR_SEND_SIGNATURE = "Ошибка при выводе подписи"
     TEXT_ERROR_SEND_TELEPHONE = "Ошибка при выводе номера телефона"
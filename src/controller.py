@@ -7,16 +7,22 @@
 """
 
 from typing import Callable
+import logging
+
+from PyQt6.QtCore import QObject, QTimer
 
 from src.windows_hotkeys import HotkeysWin
+from src.raw_keyboard import KeyboardActivity
 from src.hotkeys_handlers import HotkeysHandlers as HotkeysHandlers
 from src.try_log import log_exceptions
-from src.send_input_keys import SendInputKeyboard
+from src.send_input_keys import send_input
 import src.ll_keyboard as llk
 from src.constants import C
 
+logger = logging.getLogger(__name__)
+
 
-class Controller:
+class Controller(QObject):
     """Контроллер, обрабатывающий события горячих и специальных клавиш."""
 
     def __init__(self) -> None:
@@ -26,21 +32,29 @@ class Controller:
         ui : объект виджета
             Ссылка на UI, в который будут выводиться сообщения.
         """
+        super().__init__()
         self.llk_hook: llk.LowLevelKeyboardHook | None = None
+        self._keyboard_activity = KeyboardActivity()
+        self._hook_watchdog: QTimer | None = None
+        self._hook_lost = False  # Идёт эпизод потери хука: переустановка уже в журнале
         self.hw = HotkeysWin()
         self.hotkeys_handlers = HotkeysHandlers()
-        self.send_input_keyboards = SendInputKeyboard()
+        self.send_input_keyboards = send_input
         self.keys = llk.Keys()
 
+        # Обработчики глобальных горячих клавиш Ctrl+<vk>: vk -> обработчик
+        self._hotkey_dispatch: dict[int, Callable[[], None]] = {
+            self.keys.KEY_3: self.hotkeys_handlers.send_mail,
+            self.keys.KEY_4: self.hotkeys_handlers.send_telephone,
+            self.keys.KEY_5: self.hotkeys_handlers.run_calculator,
+            self.keys.KEY_9: self.hotkeys_handlers.send_signature,
+        }
+        # WM_HOTKEY принимается в потоке HotkeysWin, обработчик вызывается в потоке GUI
+        self.hw.hotkey.connect(self.on_hotkey)
+
     @log_exceptions
     def register_global_hotkeys(self):
-        hotkeys_win_ctrl = {
-            self.keys.KEY_3,
-            self.keys.KEY_4,
-            self.keys.KEY_5,
-            self.keys.KEY_9,
-        }
-        self.hw.register_global_hotkeys(hotkeys_win_ctrl, "control")
+        self.hw.register_global_hotkeys(set(self._hotkey_dispatch), "control")
 
     @log_exceptions
     def set_single_hotkeys(self) -> None:
@@ -53,6 +67,39 @@ class Controller:
         hook.install()
         self.llk_hook = hook
 
+        # Периодическая проверка, что Windows не сняла хук: события клавиатуры
+        # по Raw Input сравниваются с событиями, которые видел хук
+        try:
+            self._keyboard_activity.start()
+        except OSError as e:
+            logger.warning(C.LOGGER_TEXT_NO_HOOK_WATCHDOG.format(e=e))
+            return
+        self._hook_watchdog = QTimer(self)
+        self._hook_watchdog.setInterval(C.TIME_HOOK_WATCHDOG)
+        self._hook_watchdog.timeout.connect(self._check_hook)
+        self._hook_watchdog.start()
+
+    @log_exceptions
+    def _check_hook(self) -> None:
+        """
+        Переустанавливает низкоуровневый хук, если Windows его сняла.
+        Переустановка пишется в журнал один раз за эпизод: до тех пор, пока
+        событие клавиатуры снова не дойдёт до хука.
+        """
+        hook = self.llk_hook
+        if hook is None:
+            return
+        if hook.check_alive(self._keyboard_activity.last_tick):
+            if hook.events_confirmed:
+                self._hook_lost = False
+            return
+
+        if not self._hook_lost:
+            logger.warning(C.LOGGER_TEXT_HOOK_REINSTALL)
+            self._hook_lost = True
+        hook.uninstall()
+        hook.install()
+
     @log_exceptions
     def on_hotkey(self, _hk_id: int, vk: int, _mods: int) -> None:
         """
@@ -67,22 +114,20 @@ class Controller:
         mods : int
             Маска модификаторов (Alt, Ctrl, Shift, Win).
         """
-        # Добавляем сообщение в UI
-        match vk:
-            case self.keys.KEY_3:
-                self.hotkeys_handlers.send_mail()
-            case self.keys.KEY_4:
-                self.hotkeys_handlers.send_telephone()
-            case self.keys.KEY_5:
-                self.hotkeys_handlers.run_calculator()
-            case self.keys.KEY_9:
-                self.hotkeys_handlers.send_signature()
+        if handler := self._hotkey_dispatch.get(vk):
+            handler()
 
     def press_ctrl_and(self, vk: int, delay_sec: float = C.TIME_DELAY_CTRL_C_V) -> None:
         self.send_input_keyboards.press_ctrl_and_vk(vk, delay_sec)
         # llk.press_ctrl_and(vk, delay_sec)
 
     def cleanup(self):
+        """Освобождает ресурсы. Повторный вызов ничего не делает"""
+        if self._hook_watchdog is not None:
+            self._hook_watchdog.stop()
+            self._hook_watchdog = None
+        self._keyboard_activity.stop()
+
         if self.llk_hook is not None:
             self.llk_hook.uninstall()
             self.llk_hook = None
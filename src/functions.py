@@ -3,7 +3,6 @@
 import sys
 from pathlib import Path
 import logging
-import time
 
 import pygetwindow as gw  # type: ignore
 from PyQt6.QtCore import QTimer
@@ -17,6 +16,7 @@ from src.win_clipboard import (
     get_clipboard_text as win_get_clipboard_text,
     set_clipboard_text as win_set_clipboard_text,
     get_clipboard_sequence_number,
+    wait_for_clipboard_change,
 )
 
 
@@ -53,7 +53,6 @@ def show_message(
     # Находим кнопку OK и кликаем её с задержкой
     ok_button = msg_box.button(QMessageBox.StandardButton.Ok)
     if ok_button:
-        ok_button.clicked.connect(lambda: None)
         QTimer.singleShot(int(show_seconds * 1000), ok_button.click)
 
     msg_box.exec()
@@ -103,7 +102,7 @@ def get_selection() -> str:
         if text:
             return text
 
-        logger.info(C.LOGGER_TEXT_NO_IN_CLIPBOARD.format(time_delay=delay_ms))
+        logger.info(C.LOGGER_TEXT_NO_IN_CLIPBOARD, delay_ms)
 
         delay_ms += C.TIME_DELAY_CTRL_C_V  # адаптивное увеличение
 
@@ -125,7 +124,7 @@ def get_it_once(wait_ms: int) -> str:
 
     controller.press_ctrl_and(VK_C, C.TIME_DELAY_CTRL_C_V)
 
-    if wait_for_clipboard_update(seq_before, wait_ms):
+    if wait_for_clipboard_change(seq_before, wait_ms):
         return get_clipboard_text()
 
     return ""
@@ -149,12 +148,3 @@ def replace_selected_text_and_register():
     controller.press_ctrl_and(VK_V, C.TIME_DELAY_CTRL_C_V)  # Эмуляция Ctrl+v
 
     HotkeysHandlers().change_register()  # Замена регистра
-
-
-def wait_for_clipboard_update(seq_before: int, timeout_ms: int) -> bool:
-    start = time.time()
-    while (time.time() - start) * 1000 < timeout_ms:
-        if get_clipboard_sequence_number() != seq_before:
-            return True
-        time.sleep(0.01)
-    return False
@@ -31,22 +31,14 @@ class HotkeysHandlers:
             self.lib_kbd.write_text(value)
 
     @log_exceptions(C.TEXT_ERROR_CHANGE_KEYBOARD)
-    def on_caps(self) -> bool:
-        """Обработка нажатия CapsLock.
-
-        :return: True – подавить дальнейшую обработку.
-        """
+    def on_caps(self) -> None:
+        """Обработка нажатия CapsLock. Само нажатие подавляет хук клавиатуры."""
         self.change_register()
-        return True
 
     @staticmethod
-    def on_scroll() -> bool:
-        """Обработка нажатия ScrollLock.
-
-        :return: True – подавить дальнейшую обработку.
-        """
+    def on_scroll() -> None:
+        """Обработка нажатия ScrollLock. Само нажатие подавляет хук клавиатуры."""
         signals_bus.start_dialog.emit()
-        return True
 
     @log_exceptions(C.TEXT_ERROR_SEND_EMAIL)
     def send_mail(self) -> None:
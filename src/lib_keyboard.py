@@ -1,28 +1,38 @@
-import time, threading
 import logging
 
 logger = logging.getLogger(__name__)
 
-from keyboard import send, release, write
+from keyboard import send
+from PyQt6.QtCore import QTimer
 
 from src.constants import _Const as C
+from src.send_input_keys import (
+    send_input,
+    VK_CONTROL,
+    VK_LWIN,
+    VK_MENU,
+    VK_SHIFT,
+)
+
+# Модификаторы, отпускаемые перед набором текста
+MODIFIERS = [VK_CONTROL, VK_MENU, VK_SHIFT, VK_LWIN]
 
 
 class LibKeyboard:
     def write_text(self, text: str) -> None:
         """
-        Эмулирует набор текста с помощью библиотеки `keyboard`.
+        Эмулирует набор текста через SendInput (общий экземпляр `send_input`).
 
         Аргументы:
             text: Строка для вывода. Подстрока \\n заменяется на перевод строки.
 
         Поведение:
-            - Перед выводом пытается отпустить модификаторы (Ctrl, Alt, Shift, Win),
-              чтобы текст набирался в «чистом» состоянии.
-            - Добавляет короткую паузу (30 мс), затем быстро выводит весь текст
-              (`delay=0`, без восстановления состояния клавиш).
-            - Вся операция выполняется в отдельном потоке через `threading. Timer(0.05, go)` —
-              это не блокирует основной поток.
+            - Перед выводом отпускает модификаторы (Ctrl, Alt, Shift, Win) одним
+              пакетом событий, чтобы текст набирался в «чистом» состоянии.
+            - Текст печатается пакетами событий Unicode (`type_text`); переводы
+              строк (Shift+Enter) идут в тех же пакетах, без пауз между ними.
+            - Вывод откладывается на 50 мс через `QTimer.singleShot` и выполняется
+              в потоке GUI — это не блокирует обработчик горячей клавиши.
 
         Обработка ошибок:
             - `OSError`, `PermissionError` — логируются сообщением о невозможности
@@ -32,25 +42,18 @@ class LibKeyboard:
 
         def go():
             try:
-                for m in ("ctrl", "alt", "shift", "windows"):
-                    try:
-                        release(m)
-                    except Exception:
-                        pass
-                time.sleep(0.03)
-
-                lines = text.split(r"\n")
-                for i, line in enumerate(lines):
-                    write(line, delay=0, restore_state_after=False, exact=True)
-                    if i < len(lines) - 1:
-                        send("shift+enter")
+                send_input.release_keys(MODIFIERS)
+                # Весь текст вместе с переводами строк (Shift+Enter) — общими пакетами
+                send_input.type_text(
+                    text.replace(r"\n", "\n"), line_break_mods=[VK_SHIFT]
+                )
             except (OSError, PermissionError) as e:
                 # записываем в журнал отказ системы от синтетического ввода
                 logger.error(C.LOGGER_TEXT_ERROR_KEYBOARD.format(e=e))
             except Exception as e:
                 logger.exception(C.LOGGER_TEXT_UNCAUGHT.format(e=e))
 
-        threading.Timer(0.05, go).start()
+        QTimer.singleShot(50, go)
 
     def send_key(self, key: str) -> None:
         """
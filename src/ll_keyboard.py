@@ -3,6 +3,9 @@
 
 Класс LowLevelKeyboardHook позволяет регистрировать обработчики для конкретных
 виртуальных кодов клавиш (VK). Обработчики вызываются на событие WM_KEYDOWN.
+Callback хука только ставит вызов обработчика в очередь событий Qt и сразу
+возвращает управление Windows: время работы LL-хука ограничено системой
+(LowLevelHooksTimeout), а работа обработчиков не должна в него входить.
 
 Файл импортируется и на не-Windows платформах: структура и типы объявлены так,
 чтобы можно было тестировать логику диспетчеризации без Windows. Установка
@@ -18,6 +21,10 @@ import ctypes
 from ctypes import wintypes
 import sys
 
+from PyQt6.QtCore import QTimer
+
+from src.constants import C
+
 
 @dataclass
 class Keys:
@@ -42,11 +49,12 @@ WM_KEYUP = 0x0101
 WM_SYS_KEY_DOWN = 0x0104
 WM_SYS_KEYUP = 0x0105
 
-_KEY_DOWN = {WM_KEYDOWN, WM_SYS_KEY_DOWN}
-_KEY_UP = {WM_KEYUP, WM_SYS_KEYUP}
+_KEY_DOWN = frozenset({WM_KEYDOWN, WM_SYS_KEY_DOWN})
+_KEY_UP = frozenset({WM_KEYUP, WM_SYS_KEYUP})
 _KEY = _KEY_DOWN | _KEY_UP
 
 # Флаги структуры KBD_LL_HOOK_STRUCT.flags
+LL_KHF_INJECTED = 0x10  # событие синтезировано программно (SendInput/keybd_event)
 LL_KHF_UP = 0x80
 
 ULONG_PTR = (
@@ -90,12 +98,45 @@ LowLevelKeyboardProc = ctypes.WINFUNCTYPE(
 # Флаг для события клавиатуры:
 KEY_EVENT_F_KEYUP = 0x0002  # означает "отпускание клавиши"
 
+TICK_MASK = (
+    0xFFFF_FFFF  # Время событий (GetTickCount) — DWORD, переполняется за ~49.7 суток
+)
+
 # noinspection PyDeprecation
 LPKBDLLHOOKSTRUCT = ctypes.POINTER(KBD_LL_HOOK_STRUCT)
 
 user32 = ctypes.WinDLL("user32", use_last_error=True)  # Функции работы с окнами/вводом
 kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)  # Общесистемные функции
 
+# Прототипы функций задаются один раз при импорте модуля
+user32.SetWindowsHookExW.argtypes = [
+    ctypes.c_int,  # идентификатор хука
+    LowLevelKeyboardProc,  # функция обратного вызова
+    wintypes.HINSTANCE,  # дескриптор модуля
+    wintypes.DWORD,  # идентификатор потока
+]
+user32.SetWindowsHookExW.restype = HHOOK
+
+user32.CallNextHookEx.argtypes = [
+    HHOOK,
+    ctypes.c_int,
+    wintypes.WPARAM,
+    wintypes.LPARAM,
+]
+user32.CallNextHookEx.restype = L_RESULT
+_CallNextHookEx = user32.CallNextHookEx  # вызывается на каждое событие клавиатуры
+
+user32.UnhookWindowsHookEx.argtypes = [HHOOK]
+user32.UnhookWindowsHookEx.restype = wintypes.BOOL
+
+user32.keybd_event.argtypes = [wintypes.BYTE, wintypes.BYTE, wintypes.DWORD, ULONG_PTR]
+user32.keybd_event.restype = None
+
+
+def _tick_before(earlier: int, later: int) -> bool:
+    """Время earlier раньше later с учётом переполнения счётчика GetTickCount"""
+    return 0 < ((later - earlier) & TICK_MASK) <= (TICK_MASK >> 1)
+
 
 CallbackPy = Callable[[int, wintypes.WPARAM, wintypes.LPARAM], int]
 
@@ -110,39 +151,17 @@ class LowLevelKeyboardHook:
     def __init__(self, handlers: Dict[int, Callable[[], None]]):
         self.handlers = handlers
         self._hook_id: Optional[int] = None
-        self._callback: CallbackPy
-        self._callback = LowLevelKeyboardProc(self._low_level_callback)
         self._pressed: set[int] = set()
+        self.last_event_tick = 0  # Время последнего события, которое видел хук
+        self._checked_tick = 0  # Время события клавиатуры на прошлой проверке
+        self.missed_checks = 0  # Подряд проверок, на которых хук пропустил событие
+        self.events_confirmed = False  # Хук видел событие после установки
 
-        if sys.platform.startswith("win"):
-            self._init_keyboard_hook_impl()
-        else:
+        if not sys.platform.startswith("win"):
             raise OSError("Программа работает только под управлением Windows")
 
-    def _init_keyboard_hook_impl(self) -> None:
-        # Инициализируем WinAPI.
-        # Создаём C-совместимый callback
-        self._callback = LowLevelKeyboardProc(self._low_level_callback)
-
-        # Прототипы функций
-        user32.SetWindowsHookExW.argtypes = [
-            ctypes.c_int,  # идентификатор хука
-            LowLevelKeyboardProc,  # функция обратного вызова
-            wintypes.HINSTANCE,  # дескриптор модуля
-            wintypes.DWORD,  # идентификатор потока
-        ]
-        user32.SetWindowsHookExW.restype = HHOOK
-
-        user32.CallNextHookEx.argtypes = [
-            HHOOK,
-            ctypes.c_int,
-            wintypes.WPARAM,
-            wintypes.LPARAM,
-        ]
-        user32.CallNextHookEx.restype = L_RESULT
-
-        user32.UnhookWindowsHookEx.argtypes = [HHOOK]
-        user32.UnhookWindowsHookEx.restype = wintypes.BOOL
+        # C-совместимый callback. Ссылка хранится, пока установлен хук
+        self._callback: CallbackPy = LowLevelKeyboardProc(self._low_level_callback)
 
     # ------------------------------------------------------------------
     def install(self) -> None:
@@ -153,6 +172,9 @@ class LowLevelKeyboardHook:
         if not sys.platform.startswith("win"):
             raise RuntimeError("LowLevelKeyboardHook доступен только в Windows")
 
+        self._pressed.clear()
+        self.missed_checks = 0
+        self.events_confirmed = False
         self._hook_id = user32.SetWindowsHookExW(WH_KEYBOARD_LL, self._callback, 0, 0)
         if not self._hook_id:
             err = ctypes.get_last_error()
@@ -165,41 +187,68 @@ class LowLevelKeyboardHook:
             user32.UnhookWindowsHookEx(self._hook_id)
             self._hook_id = None
 
+    # ------------------------------------------------------------------
+    def check_alive(self, input_tick: int) -> bool:
+        """Проверить, что Windows не сняла хук.
+
+        Windows молча снимает WH_KEYBOARD_LL, если callback не уложился в
+        LowLevelHooksTimeout. Метод сравнивает время последнего события
+        клавиатуры в системе (input_tick, по Raw Input) со временем последнего
+        события, которое видел хук. Сам метод ничего не вводит в систему.
+        Вызывать периодически из потока, установившего хук.
+
+        Проверка учитывается, только если с прошлой проверки клавиатура дала
+        новое событие: без ввода хуку нечего пропускать. Событие, уже учтённое
+        Raw Input, callback может ещё не получить, поэтому хук считается снятым
+        после C.HOOK_MISSED_CHECKS пропусков подряд.
+
+        :param input_tick: время (мс, GetTickCount) последнего события клавиатуры
+        :return: False — хук подряд пропускает события клавиатуры.
+        """
+        if input_tick != self._checked_tick:
+            self._checked_tick = input_tick
+            self.events_confirmed = not _tick_before(self.last_event_tick, input_tick)
+            self.missed_checks = 0 if self.events_confirmed else self.missed_checks + 1
+        return self.missed_checks < C.HOOK_MISSED_CHECKS
+
     # ------------------------------------------------------------------
     def _low_level_callback(self, nCode: int, wParam: int, lParam: int) -> int:
         """Внутренний callback хука.
 
-        При WM_KEYDOWN получает vkCode и, если он есть в handlers, вызывает обработчик.
-        Передаёт событие дальше по цепочке через CallNextHookEx если вызванный обработчик вернул False
+        При WM_KEYDOWN получает vkCode и, если он есть в handlers, ставит вызов
+        обработчика в очередь событий Qt и подавляет нажатие.
+        Обработчик вызывается только на первое нажатие: автоповтор удерживаемой
+        клавиши подавляется без вызова. Синтезированные программно события
+        обработчики не вызывают.
+        Остальные события передаёт дальше по цепочке через CallNextHookEx
         """
-        if nCode != HC_ACTION:
-            return user32.CallNextHookEx(self._hook_id, nCode, wParam, lParam)
+        if nCode != HC_ACTION or wParam not in _KEY:
+            return _CallNextHookEx(self._hook_id, nCode, wParam, lParam)
 
-        if wParam not in _KEY:
-            return user32.CallNextHookEx(self._hook_id, nCode, wParam, lParam)
+        kb = KBD_LL_HOOK_STRUCT.from_address(lParam)
+        vk = kb.vkCode
+        flags = kb.flags
+        self.last_event_tick = kb.time  # для check_alive
 
-        kb = ctypes.cast(lParam, LPKBDLLHOOKSTRUCT).contents
-        is_keyup = (wParam in _KEY_UP) or bool(kb.flags & LL_KHF_UP)
+        if flags & LL_KHF_INJECTED:
+            # программный ввод (в том числе наш собственный) не обрабатываем
+            return _CallNextHookEx(self._hook_id, nCode, wParam, lParam)
 
-        if is_keyup:
+        if wParam in _KEY_UP or flags & LL_KHF_UP:
             # только освобождаем состояние, обработчик НЕ вызываем
-            self._pressed.discard(kb.vkCode)
-            return user32.CallNextHookEx(self._hook_id, nCode, wParam, lParam)
-
-        # keydown: фиксируем и вызываем обработчик
-        self._pressed.add(kb.vkCode)
-        handler = self.handlers.get(kb.vkCode)
-
-        block = False
-        if handler:
-            try:
-                block = bool(handler())  # старая сигнатура без аргументов
-            except Exception:
-                block = False
-
-        if block:
-            return 1
-        return user32.CallNextHookEx(self._hook_id, nCode, wParam, lParam)
+            self._pressed.discard(vk)
+            return _CallNextHookEx(self._hook_id, nCode, wParam, lParam)
+
+        handler = self.handlers.get(vk)
+        if handler is None:
+            return _CallNextHookEx(self._hook_id, nCode, wParam, lParam)
+
+        # keydown: только переход «отпущена → нажата» вызывает обработчик,
+        # автоповтор лишь подавляется
+        if vk not in self._pressed:
+            self._pressed.add(vk)
+            QTimer.singleShot(0, handler)
+        return 1
 
 
 # Не применяется. Заменена на SendInput
@@ -5,23 +5,38 @@ import logging
 logger = logging.getLogger(__name__)
 
 from enum import IntEnum
+from typing import Callable
 import ctypes
+from ctypes import wintypes
 
 import argparse
-from PyQt6 import uic
 from PyQt6.QtGui import QCloseEvent, QKeySequence, QShortcut
-from PyQt6.QtCore import Qt, QTimer, QCoreApplication, pyqtBoundSignal
+from PyQt6.QtCore import (
+    Qt,
+    QTimer,
+    QCoreApplication,
+    QSignalBlocker,
+    pyqtBoundSignal,
+    pyqtSlot,
+)
 
 from PyQt6.QtWidgets import QMainWindow, QDialogButtonBox, QPushButton, QMessageBox
 
 from src.signals import signals_bus
 from src.replacetext import ReplaceText
 from src.customtextedit import CustomTextEdit
+from src.ui_dialogue import Ui_Dialogue
 from src.controller import Controller
 from src.try_log import log_exceptions
 import src.functions as f
 from src.constants import C
 
+shell32 = ctypes.WinDLL("shell32", use_last_error=True)
+# Проверка токена процесса, без обращения к диску
+_IsUserAnAdmin = shell32.IsUserAnAdmin
+_IsUserAnAdmin.argtypes = []
+_IsUserAnAdmin.restype = wintypes.BOOL
+
 
 class DialogResult(IntEnum):
     EXIT = 0  # завершить / выгрузить программу
@@ -29,8 +44,21 @@ class DialogResult(IntEnum):
     SKIP = 2  # отказ от замены выделенного текста
 
 
+# Стандартные кнопки диалога
+_YES = QDialogButtonBox.StandardButton.Yes
+_NO = QDialogButtonBox.StandardButton.No
+_CANCEL = QDialogButtonBox.StandardButton.Cancel
+
+# Действие при закрытии диалога. None — действий не требуется
+_COMMAND_HANDLERS: dict[DialogResult, Callable[[], None] | None] = {
+    DialogResult.EXIT: None,  # Выгрузка программы
+    DialogResult.REPLACE: f.replace_selected_text_and_register,  # Заменяем текст
+    DialogResult.SKIP: None,  # Отказ от замены текста
+}
+
+
 # noinspection PyUnresolvedReferences
-class MainWindow(QMainWindow):
+class MainWindow(QMainWindow, Ui_Dialogue):
     """Класс организации диалога с пользователем"""
 
     # Переменные класса, определённые в Qt Designer
@@ -54,6 +82,14 @@ class MainWindow(QMainWindow):
         # Объявление имён
         self.clipboard_text = ""
         self.controller = Controller()
+        self._replacer = ReplaceText()
+        self._last_replacement = ""  # Текст, отображаемый в txtEditReplace
+        self._last_src: str | None = None  # Текст, по которому построена замена
+
+        # Отложенный пересчёт замены: серия правок обрабатывается один раз
+        self._change_timer = QTimer(self)
+        self._change_timer.setSingleShot(True)
+        self._change_timer.setInterval(C.TIME_DELAY_CHANGE_TEXT)
 
         self.init_UI()  # Загружаем файл, сформированный Qt Designer
         self.init_buttons()  # Инициализируем переменные
@@ -79,46 +115,43 @@ class MainWindow(QMainWindow):
         )
 
         # Проверка запуска программы от имени администратора
-        logger.info(C.TEXT_NO_ADMIN)
         if not self.is_admin():
+            logger.info(C.TEXT_NO_ADMIN)
             QMessageBox.warning(
                 None, C.TITLE_WARNING, C.TEXT_NO_ADMIN, QMessageBox.StandardButton.Ok
             )
 
+    @log_exceptions(C.TEXT_ERROR_LOAD_UI, reraise=True)
     def init_UI(self) -> None:
-        """Загрузка UI и атрибутов полей в объект класса"""
-        ui_path = f.get_exe_directory() / C.UI_PATH_FROM_EXE
-        if not ui_path.is_file():
-            raise FileNotFoundError(ui_path)
-        try:
-            uic.loadUi(str(ui_path), self)
-        except Exception:
-            logger.exception(C.TEXT_ERROR_LOAD_UI.format(ui_path=ui_path))
-            raise
+        """
+        Загрузка UI и атрибутов полей в объект класса.
+        Модуль ui_dialogue сгенерирован pyuic6 из _internal/dialogue.ui:
+        при запуске XML не разбирается и PyQt6.uic не импортируется
+        """
+        self.setupUi(self)
 
     def init_buttons(self):
         """Присваиваем значения переменным программы"""
-        self.yes_button = self.ensure_button(
-            self.buttonBox.button(QDialogButtonBox.StandardButton.Yes)
-        )
-        self.no_button = self.ensure_button(
-            self.buttonBox.button(QDialogButtonBox.StandardButton.No)
-        )
-        self.cancel_button = self.ensure_button(
-            self.buttonBox.button(QDialogButtonBox.StandardButton.Cancel)
-        )
+        self.yes_button = self.ensure_button(self.buttonBox.button(_YES))
+        self.no_button = self.ensure_button(self.buttonBox.button(_NO))
+        self.cancel_button = self.ensure_button(self.buttonBox.button(_CANCEL))
 
     @log_exceptions(C.TEXT_ERROR_CONNECT)
     def set_connects(self):
         """Назначаем обработчики"""
-
-        # Обработчик событий для клика кнопок
-        self.yes_button.clicked.connect(self.on_Yes)
-        self.no_button.clicked.connect(self.on_No)
-        self.cancel_button.clicked.connect(self.on_Cancel)
-
-        # Обработчик изменения оригинального текста
-        self.txtEditSource.textChanged.connect(self.change_original_text)
+        connections = (
+            # Клики кнопок идут через общую шину, как горячие клавиши окна
+            (self.yes_button.clicked, signals_bus.on_Yes),
+            (self.no_button.clicked, signals_bus.on_No),
+            (self.cancel_button.clicked, signals_bus.on_Cancel),
+            # Изменение оригинального текста и отложенный пересчёт замены
+            (self.txtEditSource.textChanged, self.change_original_text),
+            (self._change_timer.timeout, self._apply_change),
+            # Правка варианта замены пользователем
+            (self.txtEditReplace.textChanged, self.change_replacements_text),
+        )
+        for signal, slot in connections:
+            signal.connect(slot)
 
     @log_exceptions(C.TEXT_ERROR_CUSTOM_UI)
     def custom_UI(self):
@@ -139,10 +172,11 @@ class MainWindow(QMainWindow):
         QTimer.singleShot(0, self.txtEditSource.setFocus)
 
     def add_shortcuts(self) -> None:
-        self.add_shortcut("sc_yes", "1", signals_bus.on_Yes)
-        self.add_shortcut("sc_no", "2", signals_bus.on_No)
-        self.add_shortcut("sc_cancel", "3", signals_bus.on_Cancel)
-        self.add_shortcut("sc_esc", "Esc", signals_bus.on_No)
+        # Ссылки хранятся в атрибутах, чтобы горячие клавиши не удалил сборщик мусора
+        self.sc_yes = self.add_shortcut("1", signals_bus.on_Yes)
+        self.sc_no = self.add_shortcut("2", signals_bus.on_No)
+        self.sc_cancel = self.add_shortcut("3", signals_bus.on_Cancel)
+        self.sc_esc = self.add_shortcut("Esc", signals_bus.on_No)
 
     def show_original_text(self, original_text: str) -> None:
         """
@@ -150,20 +184,28 @@ class MainWindow(QMainWindow):
         :param original_text: (str). Текст пользователя
         :return:
         """
-        self.txtEditSource.setText(original_text)
+        # Без textChanged: вариант замены пересчитывает вызывающий код
+        with QSignalBlocker(self.txtEditSource):
+            self.txtEditSource.setPlainText(original_text)
 
     @log_exceptions
     def show_replacements_text(self, replacement_text: str) -> None:
         """Отображаем вариант замены текста."""
-        self.txtEditReplace.setText(replacement_text)
+        with QSignalBlocker(self.txtEditReplace):
+            self.txtEditReplace.setPlainText(replacement_text)
+        self._last_replacement = replacement_text
 
+    @pyqtSlot()
     @log_exceptions(C.TEXT_ERROR_REPLACE_TEXT)
     def on_Yes(self):
         """Заменяем выделенный текст предложенным вариантом замены"""
-        f.put_text_to_clipboard(self.txtEditReplace.toPlainText())
+        if self._change_timer.isActive():  # Последняя правка ещё не обработана
+            self._apply_change()
+        f.put_text_to_clipboard(self._last_replacement)
         self.hide()  # Освобождаем фокус для окна с выделенным текстом
         self.stop_dialogue(DialogResult.REPLACE)
 
+    @pyqtSlot()
     def on_Cancel(self) -> None:
         """Выгружаем программу"""
         self.stop_dialogue(DialogResult.EXIT)
@@ -171,6 +213,7 @@ class MainWindow(QMainWindow):
         logging.shutdown()
         QTimer.singleShot(0, self.safe_exit)
 
+    @pyqtSlot()
     @log_exceptions(C.TEXT_ERROR_ON_NO)
     def on_No(self) -> None:
         """Отказ от замены текста"""
@@ -185,18 +228,30 @@ class MainWindow(QMainWindow):
             logger.warning(C.TEXT_ERROR_PROCESSING_CLIPBOARD.format(e=e))
             return None
 
-    def on_change_original_text(self) -> None:
-        self.change_original_text()
-
+    @pyqtSlot()
     def change_original_text(self) -> None:
-        """Изменение оригинального текста"""
-        try:
-            original_text = self.txtEditSource.toPlainText()
-            replacements_text = ReplaceText().swap_keyboard_register(original_text)
+        """Изменение оригинального текста. Пересчёт откладывается до паузы в правках"""
+        self._change_timer.start()
+
+    @pyqtSlot()
+    @log_exceptions(C.TEXT_ERROR_CHANGE_TEXT)
+    def _apply_change(self) -> None:
+        """Формирование варианта замены по текущему тексту пользователя"""
+        self._change_timer.stop()
+        original_text = self.txtEditSource.toPlainText()
+        if original_text == self._last_src:  # Правки вернули текст к прежнему
+            return
+        self._last_src = original_text
+        replacements_text = self._replacer.swap_keyboard_register(original_text)
+        if replacements_text != self._last_replacement:
             self.show_replacements_text(replacements_text)
-        except Exception as e:
-            logger.exception(C.TEXT_ERROR_CHANGE_TEXT.format(e=e))
 
+    @pyqtSlot()
+    def change_replacements_text(self) -> None:
+        """Пользователь изменил вариант замены"""
+        self._last_replacement = self.txtEditReplace.toPlainText()
+
+    @pyqtSlot()
     @log_exceptions(C.TEXT_ERROR_SCROLL)
     def start_dialog(self) -> None:
         """
@@ -212,7 +267,7 @@ class MainWindow(QMainWindow):
         if self.fast_mode:
             if clipboard_text:
                 f.put_text_to_clipboard(
-                    ReplaceText().swap_keyboard_register(clipboard_text)
+                    self._replacer.swap_keyboard_register(clipboard_text)
                 )
             f.replace_selected_text_and_register()
             return
@@ -221,7 +276,8 @@ class MainWindow(QMainWindow):
         try:
             if clipboard_text is not None:
                 self.show_original_text(clipboard_text)
-                self.change_original_text()
+                self._last_src = None  # Новый диалог: замену строим заново
+                self._apply_change()
                 self.display_window()
         except Exception as e:
             logger.warning(C.TEXT_ERROR_ORIGINAL_TEXT.format(e=e))
@@ -233,7 +289,7 @@ class MainWindow(QMainWindow):
             title = window.title
         else:
             title = C.TEXT_WINDOW_NOT_FOUND
-        logger.debug(C.LOGGER_TEXT_START_DIALOGUE.format(title=title))
+        logger.debug(C.LOGGER_TEXT_START_DIALOGUE, title)
 
     def display_window(self) -> None:
         self.setWindowFlag(
@@ -255,34 +311,34 @@ class MainWindow(QMainWindow):
         Выполняем команду, заданную в параметре.
         : command: (int) - Код команды закрытия диалога
         """
-        match command:
-            case DialogResult.EXIT:  # Выгрузка программы
-                pass
-            case DialogResult.REPLACE:  # Заменяем выделенный текст
-                f.replace_selected_text_and_register()
-            case DialogResult.SKIP:  # Отказ от замены текста
-                pass
-            case _:  # Непредусмотренная команда
-                logger.critical(C.TEXT_CRITICAL_ERROR.format(command=command))
+        if command not in _COMMAND_HANDLERS:  # Непредусмотренная команда
+            logger.critical(C.TEXT_CRITICAL_ERROR.format(command=command))
+            return
+
+        handler = _COMMAND_HANDLERS[command]
+        if handler is not None:
+            handler()
 
     @log_exceptions(C.TEXT_ERROR_CONNECT_SIGNAL)
     def set_signals(self) -> None:
         """Связываем сигнал с функцией обработки"""
-        signals_bus.on_Yes.connect(self.on_Yes)
-        signals_bus.on_No.connect(self.on_No)
-        signals_bus.on_Cancel.connect(self.on_Cancel)
-        signals_bus.start_dialog.connect(self.start_dialog)
+        connections = (
+            (signals_bus.on_Yes, self.on_Yes),
+            (signals_bus.on_No, self.on_No),
+            (signals_bus.on_Cancel, self.on_Cancel),
+            (signals_bus.start_dialog, self.start_dialog),
+        )
+        for signal, slot in connections:
+            signal.connect(slot)
 
     def add_shortcut(
         self,
-        attr_name: str,
         key: str | QKeySequence,
         slot: pyqtBoundSignal,
     ) -> QShortcut:
         """
         Назначение горячей клавиши главного (единственного) окна программы
         :param self:
-        :param attr_name: Имя атрибута для сохранения ссылки, что бы не удалил сборщик мусора
         :param key: Текстовок или QKeySequence обозначение клавиши.
         :param slot: Signal, который надо активировать, при нажатии клавиши
         :return: горячая клавиша
@@ -291,7 +347,6 @@ class MainWindow(QMainWindow):
         sc.setContext(Qt.ShortcutContext.WidgetWithChildrenShortcut)
         sc.setAutoRepeat(False)
         sc.activated.connect(slot)
-        setattr(self, attr_name, sc)  # сохранить ссылку: self.sc_yes и т.п.
         return sc
 
     @staticmethod
@@ -313,7 +368,7 @@ class MainWindow(QMainWindow):
         :return: True - если в программу вошли с правами администратора.
         """
         try:
-            return bool(ctypes.windll.shell32.IsUserAnAdmin())
+            return bool(_IsUserAnAdmin())
         except Exception:
             logger.exception("Не удалось проверить права администратора")
             return False
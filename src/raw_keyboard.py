@@ -0,0 +1,199 @@
+"""
+Модуль raw_keyboard.py
+
+Назначение
+---------
+Время последнего события клавиатуры в системе по данным Raw Input. По нему
+контроллер проверяет низкоуровневый хук: если клавиатура давала события,
+а хук их не видел, Windows хук сняла. Проверка ничего не вводит в систему.
+
+Состав
+------
+- Структура `RAWINPUTDEVICE` и константы Raw Input.
+- Класс `KeyboardActivity`: окно-приёмник `WM_INPUT` и цикл его сообщений
+  в собственном потоке, атрибут `last_tick` — время последнего события.
+
+Примечания
+---------
+- Окно «только для сообщений» получает `WM_INPUT` в очередь создавшего его
+  потока, поэтому окно, подписка и цикл сообщений живут в потоке
+  `KeyboardActivity`, а не проходят через цикл событий Qt.
+- Флаг `RIDEV_INPUTSINK`: события приходят, даже когда активно чужое окно.
+- `MSG.time` измеряется в тех же единицах (мс, GetTickCount), что и
+  `KBD_LL_HOOK_STRUCT.time` в callback хука.
+"""
+
+from __future__ import annotations
+
+import ctypes
+from ctypes import wintypes
+import threading
+
+user32 = ctypes.WinDLL("user32", use_last_error=True)
+kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+HWND_MESSAGE = -3  # Родитель окна «только для сообщений»
+WM_INPUT = 0x00FF
+WM_QUIT = 0x0012
+RIDEV_REMOVE = 0x00000001
+RIDEV_INPUTSINK = 0x00000100
+HID_USAGE_PAGE_GENERIC = 0x01
+HID_USAGE_GENERIC_KEYBOARD = 0x06
+
+LPMSG = ctypes.POINTER(wintypes.MSG)
+
+
+class RAWINPUTDEVICE(ctypes.Structure):
+    _fields_ = [
+        ("usUsagePage", wintypes.USHORT),
+        ("usUsage", wintypes.USHORT),
+        ("dwFlags", wintypes.DWORD),
+        ("hwndTarget", wintypes.HWND),
+    ]
+
+
+# Прототипы задаются один раз: ctypes не подбирает типы аргументов при каждом вызове
+_CreateWindowExW = user32.CreateWindowExW
+_CreateWindowExW.argtypes = [
+    wintypes.DWORD,
+    wintypes.LPCWSTR,
+    wintypes.LPCWSTR,
+    wintypes.DWORD,
+    ctypes.c_int,
+    ctypes.c_int,
+    ctypes.c_int,
+    ctypes.c_int,
+    wintypes.HWND,
+    wintypes.HMENU,
+    wintypes.HINSTANCE,
+    wintypes.LPVOID,
+]
+_CreateWindowExW.restype = wintypes.HWND
+
+_DestroyWindow = user32.DestroyWindow
+_DestroyWindow.argtypes = [wintypes.HWND]
+_DestroyWindow.restype = wintypes.BOOL
+
+_RegisterRawInputDevices = user32.RegisterRawInputDevices
+_RegisterRawInputDevices.argtypes = [
+    ctypes.POINTER(RAWINPUTDEVICE),
+    wintypes.UINT,
+    wintypes.UINT,
+]
+_RegisterRawInputDevices.restype = wintypes.BOOL
+
+_GetMessageW = user32.GetMessageW
+_GetMessageW.argtypes = [LPMSG, wintypes.HWND, wintypes.UINT, wintypes.UINT]
+_GetMessageW.restype = wintypes.BOOL
+
+_DispatchMessageW = user32.DispatchMessageW
+_DispatchMessageW.argtypes = [LPMSG]
+_DispatchMessageW.restype = wintypes.LPARAM  # LRESULT
+
+_PostThreadMessageW = user32.PostThreadMessageW
+_PostThreadMessageW.argtypes = [
+    wintypes.DWORD,
+    wintypes.UINT,
+    wintypes.WPARAM,
+    wintypes.LPARAM,
+]
+_PostThreadMessageW.restype = wintypes.BOOL
+
+_GetCurrentThreadId = kernel32.GetCurrentThreadId
+_GetCurrentThreadId.argtypes = []
+_GetCurrentThreadId.restype = wintypes.DWORD
+
+
+class KeyboardActivity:
+    """Время последнего события клавиатуры в системе.
+
+    last_tick — время события (мс, GetTickCount), 0 — событий ещё не было.
+    Записывается потоком приёма, читается потоком GUI: это одно присваивание int.
+    """
+
+    def __init__(self) -> None:
+        self.last_tick = 0
+        self._thread: threading.Thread | None = None
+        self._thread_id = 0
+        self._ready = threading.Event()
+        self._error: BaseException | None = None
+
+    def start(self) -> None:
+        """
+        Запускает поток приёма и ждёт, пока он подпишется на Raw Input клавиатуры.
+        Повторный вызов при работающем потоке ничего не делает.
+
+        :raises OSError: если создать окно или подписаться не удалось
+        """
+        if self._thread is not None:
+            return
+
+        self._ready.clear()
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._listen, name="KeyboardActivity", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+
+        if self._error is not None:
+            error, self._error = self._error, None
+            self._thread.join()
+            self._thread = None
+            raise error
+
+    def _listen(self) -> None:
+        """
+        Тело потока приёма: создаёт окно-приёмник, подписывает его на Raw Input
+        клавиатуры и запоминает время каждого `WM_INPUT` до получения `WM_QUIT`.
+        """
+        msg = wintypes.MSG()
+        device = RAWINPUTDEVICE(
+            HID_USAGE_PAGE_GENERIC, HID_USAGE_GENERIC_KEYBOARD, RIDEV_INPUTSINK, None
+        )
+        hwnd = None
+        try:
+            # Предопределённый класс STATIC: своя оконная процедура не нужна.
+            # Вместе с окном создаётся очередь сообщений потока
+            hwnd = _CreateWindowExW(
+                0, "STATIC", None, 0, 0, 0, 0, 0, HWND_MESSAGE, None, None, None
+            )
+            if not hwnd:
+                raise ctypes.WinError(ctypes.get_last_error())
+            self._thread_id = _GetCurrentThreadId()
+
+            device.hwndTarget = hwnd
+            if not _RegisterRawInputDevices(
+                ctypes.byref(device), 1, ctypes.sizeof(device)
+            ):
+                raise ctypes.WinError(ctypes.get_last_error())
+        except BaseException as e:
+            # Любая ошибка подготовки передаётся ждущему потоку GUI
+            self._error = e
+        finally:
+            # Поток GUI ждёт _ready: он должен проснуться при любом исходе
+            self._ready.set()
+
+        try:
+            if self._error is None:
+                p_msg = ctypes.byref(msg)
+                while _GetMessageW(p_msg, None, 0, 0) > 0:
+                    if msg.message == WM_INPUT:
+                        self.last_tick = msg.time
+                    # Оконная процедура STATIC (DefWindowProc) освобождает данные WM_INPUT
+                    _DispatchMessageW(p_msg)
+                device.dwFlags = RIDEV_REMOVE
+                device.hwndTarget = None
+                _RegisterRawInputDevices(ctypes.byref(device), 1, ctypes.sizeof(device))
+        finally:
+            if hwnd:
+                _DestroyWindow(hwnd)
+
+    def stop(self) -> None:
+        """Останавливает поток приёма. Повторный вызов ничего не делает"""
+        if self._thread is None:
+            return
+
+        _PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        self._thread.join()
+        self._thread = None
@@ -1,13 +1,24 @@
 """Класс для замены символов, находящихся на одной клавише"""
 
+import re
+
 from src.symbols import en_to_ru
 
+# Обратный словарь (русский -> английский). Строится один раз при импорте
+_RU_TO_EN = {v: k for k, v in en_to_ru.items()}
 
-class ReplaceText:
-    def __init__(self):
-        # Обратный словарь (русский -> английский)
-        self.ru_to_en = {v: k for k, v in en_to_ru.items()}
+# Объединённая таблица замен. Символы, которые есть в обоих регистрах (например,
+# '.' и ','), заменяются по en_to_ru, поэтому он идёт последним
+_TRANSLATION = {**_RU_TO_EN, **en_to_ru}
+
+# Таблица для str.translate: замена выполняется одним проходом на уровне C
+_TABLE = str.maketrans(_TRANSLATION)
+
+# Класс символов, которые меняются при замене. Текст без них возвращается как есть
+_MAPPED_RE = re.compile("[" + re.escape("".join(_TRANSLATION)) + "]")
 
+
+class ReplaceText:
     def swap_keyboard_register(self, text_input: str) -> str:
         """
         Обрабатывается каждый символ строки.
@@ -16,19 +27,8 @@ class ReplaceText:
         :param text_input: (str) - Входной текст.
         :return: Текст с заменёнными символами.
         """
-        text_output = []
-        for symbol in text_input:
-            if symbol in en_to_ru:  # Если символ на английском регистре
-                text_output.append(
-                    en_to_ru[symbol]
-                )  # заменяем его на символ в русском регистре на той же клавише
-            elif symbol in self.ru_to_en:  # Если символ на русском регистре
-                text_output.append(
-                    self.ru_to_en[symbol]
-                )  # заменяем его на символ в английском регистре на той же клавише
-            else:
-                text_output.append(
-                    symbol
-                )  # Если символ вне регистров, оставляем его без изменения
-
-        return "".join(text_output)
+        if _MAPPED_RE.search(text_input) is None:  # Заменять нечего
+            return text_input
+
+        # Символ вне регистров остаётся без изменения
+        return text_input.translate(_TABLE)
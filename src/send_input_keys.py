@@ -1,18 +1,75 @@
 import time, ctypes
 from ctypes import wintypes
-from typing import SupportsFloat, SupportsInt, Sequence
+from functools import cache
+from typing import Sequence, SupportsFloat, SupportsInt
+
+from PyQt6.QtCore import QCoreApplication, QTimer
+
+from src.constants import C
+from src.try_log import log_exceptions
+from src.win_clipboard import (
+    get_clipboard_sequence_number,
+    get_clipboard_text,
+    set_clipboard_text,
+)
 
 user32 = ctypes.WinDLL("user32", use_last_error=True)
+kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
 
 # типы и константы
 ULONG_PTR = (
     ctypes.c_ulonglong if ctypes.sizeof(ctypes.c_void_p) == 8 else ctypes.c_ulong
 )
 INPUT_KEYBOARD = 1
+KEY_EVENT_F_EXTENDED_KEY = 0x0001
 KEY_EVENT_F_KEYUP = 0x0002
 KEY_EVENT_F_UNICODE = 0x0004
 VK_RETURN = 0x0D
+VK_SHIFT = 0x10
 VK_CONTROL = 0x11
+VK_MENU = 0x12  # Alt
+VK_LWIN = 0x5B
+VK_RWIN = 0x5C
+VK_LSHIFT = 0xA0
+VK_RSHIFT = 0xA1
+VK_LMENU = 0xA4
+VK_RMENU = 0xA5  # правый Alt (AltGr)
+KEY_STATE_DOWN = 0x8000  # Старший бит GetAsyncKeyState: клавиша нажата сейчас
+# Модификаторы пользователя, которые исказили бы Ctrl+<vk> (Ctrl+Shift+C и т. п.):
+# общий VK и клавиши (VK, флаги события), которые отпускаются, если он нажат.
+# Левая и правая клавиши — по отдельности: отпускание общего VK_SHIFT/VK_MENU
+# не снимает надёжно нажатую правую клавишу. Стороны опрашиваются, только
+# если нажат общий VK. Правый Alt и Win — «расширенные» клавиши, без флага
+# система примет их за другие
+STRAY_MODIFIERS = (
+    (VK_SHIFT, ((VK_LSHIFT, 0), (VK_RSHIFT, 0))),
+    (VK_MENU, ((VK_LMENU, 0), (VK_RMENU, KEY_EVENT_F_EXTENDED_KEY))),
+    (VK_LWIN, ((VK_LWIN, KEY_EVENT_F_EXTENDED_KEY),)),
+    (VK_RWIN, ((VK_RWIN, KEY_EVENT_F_EXTENDED_KEY),)),
+)
+VK_V = 0x56
+
+# Текст от стольких символов type_text вставляет через буфер обмена и Ctrl+V
+PASTE_MIN_CHARS = 200
+# Пауза перед восстановлением буфера: окно читает его после получения Ctrl+V.
+# Отсчитывается таймером Qt, поток GUI не блокируется
+CLIPBOARD_RESTORE_DELAY_MS = 500
+
+# Пауза между нажатием и отпусканием Ctrl+<vk> при hold_ms == 0: без неё
+# часть приложений не успевает обработать сочетание
+TAP_PAUSE_S = 0.01
+
+MAX_BATCH = 64  # Число событий в буфере SendInputKeyboard, отправляемых одним вызовом
+
+# Точное ожидание: time.sleep (в Python ≥ 3.11 под Windows — таймер высокого
+# разрешения) до момента за хвостом до срока, остаток — спин по perf_counter.
+# Хвост = наибольшее измеренное опоздание sleep, но не меньше SPIN_TAIL_S
+SPIN_TAIL_S = 0.0005
+SPIN_CALIBRATION_ROUNDS = 10  # Число пробных sleep(1 мс) при калибровке хвоста
+SPIN_ONLY_MS = 2.0  # Более короткие ожидания целиком выполняются спином
+MIN_WAIT_MS = 0.5  # Ожидания короче — ниже точности планировщика, не выполняются
+SPIN_YIELD_EVERY = 64  # Раз в столько итераций спин уступает процессор
+SPIN_YIELD_MIN_S = 0.00005  # Ближе к сроку не уступаем: можно проспать его
 
 
 # noinspection DuplicatedCode
@@ -60,12 +117,58 @@ class HARDWARE_INPUT(ctypes.Structure):
     )
 
 
+class INPUT_UNION(ctypes.Union):
+    """Полная полезная нагрузка INPUT. Нужна только для её размера"""
+
+    _fields_ = (("mi", MOUSE_INPUT), ("ki", KEYBDINPUT), ("hi", HARDWARE_INPUT))
+
+
 class INPUT(ctypes.Structure):
-    class _U(ctypes.Union):
-        _fields_ = (("mi", MOUSE_INPUT), ("ki", KEYBDINPUT), ("hi", HARDWARE_INPUT))
+    """
+    INPUT только с клавиатурной частью. Мышь и HARDWARE_INPUT не используются.
+    Хвост дополнен до размера INPUT_UNION: SendInput проверяет cbSize,
+    а выравнивание KEYBDINPUT совпадает с выравниванием объединения.
+    """
 
-    _anonymous_ = ("u",)
-    _fields_ = (("type", wintypes.DWORD), ("u", _U))
+    _fields_ = (
+        ("type", wintypes.DWORD),
+        ("ki", KEYBDINPUT),
+        (
+            "_pad",
+            ctypes.c_byte * (ctypes.sizeof(INPUT_UNION) - ctypes.sizeof(KEYBDINPUT)),
+        ),
+    )
+
+
+SIZEOF_INPUT = ctypes.sizeof(INPUT)
+
+_SendInput = user32.SendInput  # вызывается на каждую отправку событий
+_SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+_SendInput.restype = wintypes.UINT
+
+_GetAsyncKeyState = user32.GetAsyncKeyState
+_GetAsyncKeyState.argtypes = (ctypes.c_int,)
+_GetAsyncKeyState.restype = wintypes.SHORT
+
+# Уступить остаток кванта другому готовому потоку (в т. ч. соседу по ядру SMT)
+kernel32.SwitchToThread.argtypes = ()
+kernel32.SwitchToThread.restype = wintypes.BOOL
+
+
+@cache
+def calibrate_spin_tail() -> float:
+    """
+    Измеряет, насколько time.sleep(1 мс) опаздывает на этой машине.
+    Выполняется один раз за процесс, при первом ожидании, которому нужен sleep.
+
+    :return: длительность спин-хвоста ожидания в секундах
+    """
+    max_dt = 0.0
+    for _ in range(SPIN_CALIBRATION_ROUNDS):
+        t0 = time.perf_counter()
+        time.sleep(0.001)
+        max_dt = max(max_dt, time.perf_counter() - t0)
+    return max(SPIN_TAIL_S, max_dt - 0.001 + SPIN_TAIL_S)
 
 
 class SendInputKeyboard(object):
@@ -76,6 +179,7 @@ class SendInputKeyboard(object):
       - press_ctrl_and_vk(vk, hold_ms): Ctrl+<vk> детерминировано, с точным удержанием.
       - type_text(s, per_char_delay_ms): посимвольный ввод Unicode (KEY_EVENT_F_UNICODE).
       - press_combo(mods, vk, hold_ms): произвольные сочетания модификаторов с клавишей.
+      - release_keys(vks): отпускание клавиш (например, модификаторов) одним пакетом.
 
     Платформа:
       Windows, Python 3.x, ctypes. Ввод идёт в foreground-окно.
@@ -96,21 +200,52 @@ class SendInputKeyboard(object):
       ik.type_text("Привет", 2)          # по 2 мс между символами
     """
 
+    def __init__(self) -> None:
+        # Буфер событий создаётся один раз. Методы заполняют его слоты на месте
+        # и отправляют первые n слотов (_send_n), не создавая новых структур INPUT
+        self._buf = (INPUT * MAX_BATCH)()
+        for slot in self._buf:
+            slot.type = INPUT_KEYBOARD
+        # Готовые события Ctrl+<vk> по коду vk: (нажатия, отпускания)
+        self._ctrl_vk_cache: dict[int, tuple[ctypes.Array, ctypes.Array]] = {}
+
     def _busy_wait_ms(self, ms: SupportsFloat) -> None:
         """
         Точное ожидание ms миллисекунд.
         Использует sleep для грубой части и спин-ожидание для точной доводки.
+        Ожидания короче MIN_WAIT_MS пропускаются.
         """
         ms = float(ms)
-        if ms <= 0:
+        if ms < MIN_WAIT_MS:
             return
+        self._wait(*self._plan_wait(ms))
+
+    @staticmethod
+    def _plan_wait(ms: float) -> tuple[float, float]:
+        """
+        Разбивает ожидание ms > 0 миллисекунд на части.
+        Считается один раз на серию одинаковых ожиданий.
+
+        :return: (длительность sleep, полная длительность) в секундах
+        """
+        total_s = ms / 1000.0
+        if ms < SPIN_ONLY_MS:
+            return 0.0, total_s
+        # Калибровка (при первом вызове) — до отсчёта срока
+        return max(0.0, total_s - calibrate_spin_tail()), total_s
+
+    @staticmethod
+    def _wait(coarse_s: float, total_s: float) -> None:
+        """Ожидание по плану _plan_wait: sleep coarse_s, затем спин до total_s"""
+        t_end = time.perf_counter() + total_s
         # грубо уснём, тонко — доспим
-        coarse = max(0.0, ms / 1000.0 - 0.002)
-        if coarse > 0:
-            time.sleep(coarse)
-        t_end = time.perf_counter() + (ms / 1000.0 - coarse)
-        while time.perf_counter() < t_end:
-            pass
+        if coarse_s:
+            time.sleep(coarse_s)
+        spins = 0
+        while (now := time.perf_counter()) < t_end:
+            spins += 1
+            if spins % SPIN_YIELD_EVERY == 0 and t_end - now > SPIN_YIELD_MIN_S:
+                kernel32.SwitchToThread()
 
     def _clamp_hold_ms(self, ms: SupportsInt) -> int:
         """
@@ -139,9 +274,13 @@ class SendInputKeyboard(object):
                 Нормализуется в диапазон 0..1000. 0 = без удержания.
 
         Поведение:
-            - При ms==0 отправляет пакет из четырёх событий: Ctrl↓, Key↓, Key↑, Ctrl↑.
-            - При ms>0 отправляет Ctrl↓+Key↓, ждёт ms (гибрид sleep+spin), затем Key↑+Ctrl↑.
-            - В finally дублирует отпускания для страховки от «залипания».
+            - Отправляет Ctrl↓+Key↓, ждёт ms (гибрид sleep+spin; при ms==0 — TAP_PAUSE_S),
+              затем Key↑+Ctrl↑.
+            - Если пользователь держит Shift, Alt или Win, они отпускаются на время
+              сочетания и нажимаются снова после него (_press_ctrl_and_vk_held).
+            - События для каждого vk заполняются один раз и кэшируются (_ctrl_vk_inputs).
+            - Если отправка прервалась исключением, повторяет отпускания для страховки
+              от «залипания» и пробрасывает исключение дальше.
 
         Исключения:
             OSError: ошибка SendInput (например, неверный размер INPUT или блокировка ввода).
@@ -151,105 +290,170 @@ class SendInputKeyboard(object):
         """
 
         ms = self._clamp_hold_ms(hold_ms)
+        if held := self._held_modifiers():
+            self._press_ctrl_and_vk_held(vk, ms, held)
+            return
+
+        down2, up2 = self._ctrl_vk_inputs(vk)
         try:
-            if ms == 0:
-                self._send([self._vk(VK_CONTROL, 0)])
-                self._send([self._vk(vk, 0)])
-
-                time.sleep(0.01)
-
-                self._send([self._vk(vk, KEY_EVENT_F_KEYUP)])
-                self._send([self._vk(VK_CONTROL, KEY_EVENT_F_KEYUP)])
-                # self._send(
-                #     [
-                #         self._vk(VK_CONTROL, 0),
-                #         self._vk(vk, 0),
-                #         self._vk(vk, KEY_EVENT_F_KEYUP),
-                #         self._vk(VK_CONTROL, KEY_EVENT_F_KEYUP),
-                #     ]
-                # )
+            self._send_inputs(down2)
+            self._hold(ms)
+            self._send_inputs(up2)
+        except BaseException:
+            # страховка от залипания — только если штатные отпускания не прошли
+            try:
+                self._send_inputs(up2)
+            except OSError:
+                pass
+            raise
+
+    def _hold(self, ms: int) -> None:
+        """Удержание клавиши ms миллисекунд; при ms == 0 — короткая пауза TAP_PAUSE_S"""
+        if ms == 0:
+            time.sleep(TAP_PAUSE_S)
+        else:
+            self._busy_wait_ms(ms)
+
+    @staticmethod
+    def _held_modifiers() -> list[tuple[int, int]]:
+        """
+        Модификаторы (VK, флаги) из STRAY_MODIFIERS, которые сейчас нажаты.
+        Без нажатых модификаторов — четыре вызова GetAsyncKeyState.
+        """
+        held: list[tuple[int, int]] = []
+        for generic, sides in STRAY_MODIFIERS:
+            if not _GetAsyncKeyState(generic) & KEY_STATE_DOWN:
+                continue
+            if len(sides) == 1:
+                held.extend(sides)
             else:
-                self._send([self._vk(VK_CONTROL, 0), self._vk(vk, 0)])
-                self._busy_wait_ms(ms)
-                self._send(
-                    [
-                        self._vk(vk, KEY_EVENT_F_KEYUP),
-                        self._vk(VK_CONTROL, KEY_EVENT_F_KEYUP),
-                    ]
+                held.extend(
+                    mod for mod in sides if _GetAsyncKeyState(mod[0]) & KEY_STATE_DOWN
                 )
-        finally:
-            # страховка от залипания
+        return held
+
+    def _press_ctrl_and_vk_held(
+        self, vk: int, ms: int, held: list[tuple[int, int]]
+    ) -> None:
+        """
+        Ctrl+<vk>, когда пользователь держит модификаторы held — именно эти
+        клавиши (левые или правые). Они отпускаются после Ctrl↓ и нажимаются
+        снова после Ctrl↑:
+        Ctrl↓, held↑, Key↓, [ожидание ms], Key↑, Ctrl↑, held↓.
+        Ctrl↓ идёт первым, чтобы отпускание Alt или Win не открыло меню.
+        """
+        _, up2 = self._ctrl_vk_inputs(vk)
+        try:
+            self._set_vk(0, VK_CONTROL, 0)
+            n = 1
+            for m, flags in held:
+                self._set_vk(n, m, flags | KEY_EVENT_F_KEYUP)
+                n += 1
+            self._set_vk(n, vk, 0)
+            self._send_n(n + 1)
+            self._hold(ms)
+            self._set_vk(0, vk, KEY_EVENT_F_KEYUP)
+            self._set_vk(1, VK_CONTROL, KEY_EVENT_F_KEYUP)
+            n = 2
+            for m, flags in held:
+                self._set_vk(n, m, flags)
+                n += 1
+            self._send_n(n)
+        except BaseException:
+            # страховка от залипания Ctrl и vk; модификаторы остаются отпущенными
             try:
-                self._send(
-                    [
-                        self._vk(vk, KEY_EVENT_F_KEYUP),
-                        self._vk(VK_CONTROL, KEY_EVENT_F_KEYUP),
-                    ]
-                )
+                self._send_inputs(up2)
             except OSError:
                 pass
+            raise
 
-    def _send(self, seq: Sequence[INPUT]) -> None:
+    def _ctrl_vk_inputs(self, vk: int) -> tuple[ctypes.Array, ctypes.Array]:
+        """
+        События Ctrl+<vk>, заполненные один раз на код vk:
+        Ctrl↓, Key↓, Key↑, Ctrl↑.
+
+        Возврат:
+          (первые два события — нажатия, последние два — отпускания).
+          Половины — представления одного массива, а не копии.
         """
-        Вспомогательная отправка массива INPUT через SendInput с проверкой результата.
+        cached = self._ctrl_vk_cache.get(vk)
+        if cached is not None:
+            return cached
+
+        full4 = (INPUT * 4)()
+        for slot, (key, flags) in zip(
+            full4,
+            (
+                (VK_CONTROL, 0),
+                (vk, 0),
+                (vk, KEY_EVENT_F_KEYUP),
+                (VK_CONTROL, KEY_EVENT_F_KEYUP),
+            ),
+        ):
+            slot.type = INPUT_KEYBOARD
+            slot.ki.wVk = key
+            slot.ki.dwFlags = flags
+        down2 = (INPUT * 2).from_buffer(full4)
+        up2 = (INPUT * 2).from_buffer(full4, 2 * SIZEOF_INPUT)
+
+        cached = self._ctrl_vk_cache[vk] = down2, up2
+        return cached
+
+    def _send_n(self, n: int) -> None:
+        """
+        Отправка первых n слотов буфера событий через SendInput с проверкой результата.
 
         Параметры:
-            seq (list[INPUT]): Список подготовленных событий клавиатуры.
+            n (int): Число заполненных слотов буфера (не больше MAX_BATCH).
 
         Исключения:
-            OSError: если SendInput вернул число < len(seq).
+            OSError: если SendInput вернул число < n.
         """
-        arr = (INPUT * len(seq))(*seq)
-        sent = user32.SendInput(len(seq), arr, ctypes.sizeof(INPUT))
-        if sent != len(seq):
+        sent = _SendInput(n, self._buf, SIZEOF_INPUT)
+        if sent != n:
             raise ctypes.WinError(ctypes.get_last_error())
 
-    def _vk(self, vk: int, flags: int = 0) -> INPUT:
+    @staticmethod
+    def _send_inputs(inputs: ctypes.Array) -> None:
         """
-        Формирует INPUT для клавиатурного события по виртуальному коду (VK).
-
-        Параметры:
-            vk: код VK целевой клавиши (напр. VK_CONTROL, VK_V).
-            flags: маска KEY_EVENT_F_* (0 — нажатие; KEY_EVENT_F_KEYUP — отпускание).
+        Отправка готового массива событий целиком (без копирования в буфер).
 
-        Возвращает:
-            INPUT с type=INPUT_KEYBOARD и KEYBDINPUT(wVk=vk, wScan=0, dwFlags=flags, time=0, dwExtraInfo=0).
-
-        Примечание:
-            Для scancode/UNICODE нужны отдельные конструкторы.
+        Исключения:
+            OSError: если SendInput вернул число меньше длины массива.
         """
-        i = INPUT()
-        i.type = INPUT_KEYBOARD
-        i.ki = KEYBDINPUT(vk, 0, flags, 0, 0)
-        return i
+        n = len(inputs)
+        sent = _SendInput(n, inputs, SIZEOF_INPUT)
+        if sent != n:
+            raise ctypes.WinError(ctypes.get_last_error())
 
-    def _uni(self, code_unit: int, keyup: bool = False) -> INPUT:
+    def _set_vk(self, i: int, vk: int, flags: int = 0) -> None:
         """
-        Построить INPUT для одной кодовая единица (UTF-16) (KEY_EVENT_F_UNICODE).
-        Примечание: если исходные данные в UTF-8, сначала декодируйте в str
-        и используйте _send_unicode_char/type_text. Непосредственно UTF-8
-        в SendInput не передаётся.
+        Записывает в слот i буфера клавиатурное событие по виртуальному коду (VK).
 
         Параметры:
-          code_unit: кодовая единица (UTF-16) (в т. ч. суррогаты).
-          keyup: True — отпускание, False — нажатие.
+            i: номер слота буфера.
+            vk: код VK целевой клавиши.
+            flags: маска KEY_EVENT_F_* (0 — нажатие; KEY_EVENT_F_KEYUP — отпускание).
+        """
+        ki = self._buf[i].ki
+        ki.wVk = vk
+        ki.wScan = 0
+        ki.dwFlags = flags
 
-        Поведение:
-          Формирует KEYBDINPUT с wVk=0, wScan=code_unit, dwFlags=KEY_EVENT_F_UNICODE | [KEYUP].
+    def _set_uni(self, i: int, code_unit: int, keyup: bool = False) -> None:
+        """
+        Записывает в слот i буфера событие для кодовой единицы UTF-16
+        (KEY_EVENT_F_UNICODE).
 
-        Возврат:
-          Готовая структура INPUT для SendInput.
-        """
-        e = INPUT()
-        e.type = 1  # INPUT_KEYBOARD
-        e.ki = KEYBDINPUT(
-            0,
-            code_unit,
-            KEY_EVENT_F_UNICODE | (KEY_EVENT_F_KEYUP if keyup else 0),
-            0,
-            0,
-        )
-        return e
+        Параметры:
+            i: номер слота буфера.
+            code_unit: кодовая единица (UTF-16) (в т. ч. суррогаты).
+            keyup: True — отпускание, False — нажатие.
+        """
+        ki = self._buf[i].ki
+        ki.wVk = 0
+        ki.wScan = code_unit
+        ki.dwFlags = KEY_EVENT_F_UNICODE | (KEY_EVENT_F_KEYUP if keyup else 0)
 
     def _send_unicode_char(self, ch: str) -> None:
         """
@@ -263,45 +467,187 @@ class SendInputKeyboard(object):
         Примечание:
           Модификаторы (Ctrl/Alt/Shift) тут не участвуют. Для сочетаний используйте press_combo().
         """
+        self._send_n(self._put_char(0, ch))
+
+    def _put_char(self, i: int, ch: str) -> int:
+        """
+        Записать в буфер события одного символа, начиная со слота i
+        (правила — как в _send_unicode_char). Занимает не больше 4 слотов.
+
+        Возврат:
+          Номер первого свободного слота после записанных событий.
+        """
         cp = ord(ch)
 
         if ch == "\n":
-            self._send([self._vk(VK_RETURN, 0), self._vk(VK_RETURN, KEY_EVENT_F_KEYUP)])
-            return
+            return self._put_line_break(i, ())
 
         if cp <= 0xFFFF:
-            self._send([self._uni(cp, False), self._uni(cp, True)])
-            return
+            self._set_uni(i, cp, False)
+            self._set_uni(i + 1, cp, True)
+            return i + 2
 
         cp -= 0x10000
         high = 0xD800 + ((cp >> 10) & 0x3FF)
         low = 0xDC00 + (cp & 0x3FF)
-        self._send(
-            [
-                self._uni(high, False),
-                self._uni(low, False),
-                self._uni(low, True),
-                self._uni(high, True),
-            ]
-        )
+        self._set_uni(i, high, False)
+        self._set_uni(i + 1, low, False)
+        self._set_uni(i + 2, low, True)
+        self._set_uni(i + 3, high, True)
+        return i + 4
+
+    def _put_line_break(self, i: int, mods: Sequence[int]) -> int:
+        """
+        Записать в буфер перевод строки, начиная со слота i:
+        модификаторы mods ↓, VK_RETURN ↓↑, модификаторы ↑ в обратном порядке.
+        Занимает 2 + 2 * len(mods) слотов.
+
+        Возврат:
+          Номер первого свободного слота после записанных событий.
+        """
+        for m in mods:
+            self._set_vk(i, m, 0)
+            i += 1
+        self._set_vk(i, VK_RETURN, 0)
+        self._set_vk(i + 1, VK_RETURN, KEY_EVENT_F_KEYUP)
+        i += 2
+        for m in reversed(mods):
+            self._set_vk(i, m, KEY_EVENT_F_KEYUP)
+            i += 1
+        return i
 
-    def type_text(self, s: str, per_char_delay_ms: int = 0) -> None:
+    def type_text(
+        self,
+        s: str,
+        per_char_delay_ms: int = 0,
+        line_break_mods: Sequence[int] = (),
+    ) -> None:
         """
         Посимвольно напечатать строку Unicode.
 
         Параметры:
           s: текст
           per_char_delay_ms: задержка между символами в мс (0 — без пауз).
+          line_break_mods: модификаторы, с которыми нажимается Enter на месте \n
+            (например, [VK_SHIFT] — Shift+Enter). Перевод строки идёт в том же
+            пакете событий, что и текст.
 
         Замечания:
-          Для коротких строк (≤200 символов) посимвольный ввод достаточен.
-          Для длинных строк лучше пакетировать события или вставлять через буфер обмена.
+          Без задержки строка один раз перекодируется в UTF-16, каждая кодовая
+          единица (в т. ч. суррогат) даёт пару нажатие+отпускание. События копятся
+          в буфере и отправляются пакетами до MAX_BATCH событий за один вызов SendInput.
+          С задержкой каждый символ отправляется отдельно, чтобы сохранить паузы.
+          Без задержки строка от PASTE_MIN_CHARS символов вставляется через
+          буфер обмена (type_text_fast), если в нём лежит текст, который можно
+          вернуть, и переводы строк не требуют модификаторов: вставка даёт
+          «голый» перевод строки, а Enter в чатах отправляет сообщение.
+          Если буфер недоступен, строка печатается событиями SendInput.
         """
         delay = max(0, int(per_char_delay_ms))
-        for ch in s:
-            self._send_unicode_char(ch)
-            if delay:
-                self._busy_wait_ms(delay)
+        if (
+            not delay
+            and len(s) >= PASTE_MIN_CHARS
+            and not (line_break_mods and "\n" in s)
+            and self.type_text_fast(s)
+        ):
+            return
+        if delay:
+            plan = self._plan_wait(delay)  # одинаковое ожидание после каждого символа
+            for ch in s:
+                if ch == "\n":
+                    self._send_n(self._put_line_break(0, line_break_mods))
+                else:
+                    self._send_unicode_char(ch)
+                self._wait(*plan)
+            return
+
+        break_slots = 2 + 2 * len(line_break_mods)
+        if break_slots > MAX_BATCH:
+            raise ValueError(f"Слишком много модификаторов: {len(line_break_mods)}")
+        n = 0
+        for line_no, line in enumerate(s.split("\n")):
+            if line_no:  # между строками — Enter (с модификаторами line_break_mods)
+                if n > MAX_BATCH - break_slots:
+                    self._send_n(n)
+                    n = 0
+                n = self._put_line_break(n, line_break_mods)
+            # кодовые единицы UTF-16 (порядок байт Windows — little-endian)
+            for code_unit in memoryview(line.encode("utf-16-le")).cast("H"):
+                if n > MAX_BATCH - 2:
+                    self._send_n(n)
+                    n = 0
+                self._set_uni(n, code_unit, False)
+                self._set_uni(n + 1, code_unit, True)
+                n += 2
+        if n:
+            self._send_n(n)
+
+    def type_text_fast(self, s: str) -> bool:
+        """
+        Вставить строку через буфер обмена: записать её в буфер и нажать Ctrl+V.
+        Число событий клавиатуры не зависит от длины строки.
+
+        Работает, только если в буфере лежит текст: его можно вернуть.
+        Пустой буфер или буфер с другими данными (картинка, файлы) не трогается.
+
+        Текст, бывший в буфере, возвращается таймером Qt через
+        CLIPBOARD_RESTORE_DELAY_MS, без блокировки потока GUI. Если за это время
+        буфер изменил кто-то другой, он не перезаписывается. Таймеру нужен
+        цикл событий Qt в вызывающем потоке; без приложения Qt
+        (QCoreApplication) буфер не трогается.
+
+        Возврат:
+          True — строка вставлена; False — вставка невозможна (нет приложения Qt,
+          в буфере нет текста, буфер занят другим процессом), ничего не отправлено.
+
+        Исключения:
+          OSError: ошибка SendInput при Ctrl+V. Прежний текст к этому моменту
+          возвращается в буфер; повторять ввод нельзя — вставка могла пройти.
+        """
+        if QCoreApplication.instance() is None:
+            return False
+        try:
+            old_text = get_clipboard_text()
+        except OSError:
+            return False  # буфер держит другой процесс
+        if not old_text:
+            return False
+
+        try:
+            set_clipboard_text(s)
+        except OSError:
+            # запись могла успеть очистить буфер: возвращаем прежний текст
+            self._put_clipboard_back(old_text)
+            return False
+        seq = get_clipboard_sequence_number()
+        try:
+            self.press_ctrl_and_vk(VK_V)
+        except BaseException:
+            self._put_clipboard_back(old_text)
+            raise
+        QTimer.singleShot(
+            CLIPBOARD_RESTORE_DELAY_MS, lambda: _restore_clipboard_text(old_text, seq)
+        )
+        return True
+
+    @staticmethod
+    def _put_clipboard_back(text: str) -> None:
+        """Вернуть text в буфер обмена после неудачной вставки; ошибку не пробрасывать"""
+        try:
+            set_clipboard_text(text)
+        except OSError:
+            pass
+
+    def release_keys(self, vks: list[int]) -> None:
+        """
+        Отпустить клавиши vks одним вызовом SendInput (по событию KEY_UP на клавишу).
+        Отпускание не нажатой клавиши безвредно.
+        """
+        if len(vks) > MAX_BATCH:
+            raise ValueError(f"Слишком много клавиш: {len(vks)}")
+        for i, vk in enumerate(vks):
+            self._set_vk(i, vk, KEY_EVENT_F_KEYUP)
+        self._send_n(len(vks))
 
     def press_combo(self, mods: list[int], vk: int, hold_ms: int = 0) -> None:
         """
@@ -320,13 +666,39 @@ class SendInputKeyboard(object):
         Пример:
           press_combo([VK_SHIFT], VK_RETURN)  # Shift+Enter
         """
-        downs = [self._vk(m, 0) for m in mods] + [self._vk(vk, 0)]
-        ups = [self._vk(vk, KEY_EVENT_F_KEYUP)] + [
-            self._vk(m, KEY_EVENT_F_KEYUP) for m in reversed(mods)
-        ]
-        if hold_ms <= 0:
-            self._send(downs + ups)
-        else:
-            self._send(downs)
+        n_keys = len(mods) + 1
+        if 2 * n_keys > MAX_BATCH:
+            raise ValueError(f"Слишком много модификаторов: {len(mods)}")
+
+        # нажатия: слоты 0..n_keys-1
+        for i, m in enumerate(mods):
+            self._set_vk(i, m, 0)
+        self._set_vk(n_keys - 1, vk, 0)
+
+        if hold_ms > 0:
+            self._send_n(n_keys)
             self._busy_wait_ms(hold_ms)
-            self._send(ups)
+            start = 0  # отпускания пишутся поверх отправленных нажатий
+        else:
+            start = n_keys  # отпускания идут в том же пакете следом за нажатиями
+
+        # отпускания в обратном порядке: vk, затем модификаторы справа налево
+        self._set_vk(start, vk, KEY_EVENT_F_KEYUP)
+        for i, m in enumerate(reversed(mods), start + 1):
+            self._set_vk(i, m, KEY_EVENT_F_KEYUP)
+        self._send_n(start + n_keys)
+
+
+@log_exceptions(C.TEXT_ERROR_RESTORE_CLIPBOARD)
+def _restore_clipboard_text(text: str, seq: int) -> None:
+    """
+    Вернуть в буфер обмена text, если буфер не менялся после вставки
+    (номер последовательности всё ещё seq).
+    """
+    if get_clipboard_sequence_number() == seq:
+        set_clipboard_text(text)
+
+
+# Общий экземпляр на процесс: один буфер событий для всех вызывающих.
+# Все вызовы идут из потока GUI, поэтому буфер не делится между потоками
+send_input = SendInputKeyboard()
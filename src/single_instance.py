@@ -4,24 +4,38 @@
 
 Назначение
 ---------
-Обеспечение единственности экземпляра приложения на основе Qt.
-Использует механизм `QSharedMemory` для проверки и блокировки повторного запуска.
+Обеспечение единственности экземпляра приложения.
+Использует именованный мьютекс Windows (`CreateMutexW`) для проверки и блокировки
+повторного запуска.
 
 
 Состав
 ------
-- Класс `SingleInstance`, который работает с разделяемой памятью:
+- Класс `SingleInstance`, который работает с именованным мьютексом:
 * `already_running()` — проверяет, запущен ли другой экземпляр.
-* `claim_ownership()` — создаёт сегмент памяти и тем самым закрепляет за собой «право владения».
+* `cleanup()` — закрывает дескриптор мьютекса.
 
 
 Примечания
 ---------
-- Для идентификации используется строковый ключ (по умолчанию "__hotkey_singleton__").
-- Реализация кроссплатформенная, так как основана на Qt.
+- Для идентификации используется строковый ключ (по умолчанию — сгенерированный UUID).
+- Проверка выполняется одним системным вызовом при создании объекта.
+- Мьютекс освобождается системой при завершении процесса, в том числе аварийном,
+  поэтому «зависших» блокировок после сбоя не остаётся.
 """
 
-from PyQt6 import QtCore
+import ctypes
+from ctypes import wintypes
+
+kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+ERROR_ALREADY_EXISTS = 183
+
+kernel32.CreateMutexW.argtypes = [wintypes.LPVOID, wintypes.BOOL, wintypes.LPCWSTR]
+kernel32.CreateMutexW.restype = wintypes.HANDLE
+
+kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+kernel32.CloseHandle.restype = wintypes.BOOL
 
 
 class SingleInstance:
@@ -31,36 +45,32 @@ class SingleInstance:
     Аргументы конструктора
     ----------------------
     key : str
-    Уникальный строковый ключ для идентификации сегмента памяти.
+    Уникальный строковый ключ — имя мьютекса.
 
 
     Методы
     ------
     already_running() -> bool
-    Возвращает True, если сегмент памяти с ключом уже существует,
+    Возвращает True, если мьютекс с ключом уже существовал при создании объекта,
     то есть запущен другой экземпляр приложения
-    claim_ownership() -> bool
-    Пытается создать сегмент памяти (размером 1 байт).
-    Возвращает True, если удалось создать сегмент и данный процесс стал владельцем.
+    cleanup() -> None
+    Закрывает дескриптор мьютекса.
     """
 
     def __init__(self, key="b3763eeb-ec63-4245-a014-5fd2b240e294"):
         # key - сгенерированный UUID
 
-        self.mem = QtCore.QSharedMemory(key)
+        self._mutex = kernel32.CreateMutexW(None, False, key)
+        if not self._mutex:
+            raise ctypes.WinError(ctypes.get_last_error())
+        self._already = ctypes.get_last_error() == ERROR_ALREADY_EXISTS
 
     def already_running(self) -> bool:
-        """
-        True, если сегмент памяти с ключом уже существует (другой процесс запущен).
-        Подключается к сегменту только для проверки и сразу отцепляется.
-        """
-        if self.mem.create(1):
-            return False
-        if self.mem.attach():
-            self.mem.detach()
-        return True
+        """True, если мьютекс с ключом уже существовал (другой процесс запущен)."""
+        return self._already
 
     def cleanup(self):
-        """Освобождение памяти — другие процессы могут работать"""
-        if self.mem.isAttached():
-            self.mem.detach()
+        """Закрытие мьютекса — другие процессы могут работать"""
+        if self._mutex:
+            kernel32.CloseHandle(self._mutex)
+            self._mutex = None
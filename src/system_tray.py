@@ -20,6 +20,7 @@ from PyQt6 import QtWidgets, QtGui
 
 
 from src.constants import C
+from src.try_log import log_exceptions
 from src.functions import get_exe_directory
 
 
@@ -57,6 +58,7 @@ class Tray(QtWidgets.QSystemTrayIcon):
         self.setContextMenu(menu)
         self.setVisible(True)
 
+    @log_exceptions(C.TEXT_ERROR_CONNECT_SIGNAL)
     def _create_menu(
         self,
         on_quit: Callable[[], None],
@@ -76,23 +78,14 @@ class Tray(QtWidgets.QSystemTrayIcon):
         menu = QtWidgets.QMenu()
 
         for text, handler in actions.items():
-            act = menu.addAction(text)
-            try:
-                if not act:
-                    continue
-                if text in disabled_actions:
+            if text in disabled_actions:
+                act = menu.addAction(text)
+                if act:
                     act.setEnabled(False)
-                    continue
-                act.triggered.connect(lambda checked=False, h=handler: h())
-            except Exception:
-                logger.error(C.TEXT_ERROR_CONNECT_SIGNAL)
-
-        quit_action = menu.addAction("Выход")
-        try:
-            if quit_action:
-                quit_action.triggered.connect(lambda checked=False: on_quit())
-        except Exception:
-            logger.exception(C.TEXT_ERROR_CONNECT_SIGNAL)
+                continue
+            menu.addAction(text, handler)  # обработчик подключается самим Qt
+
+        menu.addAction("Выход", on_quit)
 
         return menu
 
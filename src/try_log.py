@@ -10,12 +10,14 @@ def log_exceptions(_fn=None, *, name: str | None = None, reraise: bool = False):
         _fn = None
 
     def _decorate(fn):
+        message = name or fn.__qualname__  # вычисляется один раз при декорировании
+
         @wraps(fn)
         def w(*a, **k):
             try:
                 return fn(*a, **k)
             except Exception:
-                logger.exception(name or fn.__qualname__)
+                logger.exception(message)
                 if reraise:
                     raise
 
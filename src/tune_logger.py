@@ -17,7 +17,7 @@
 * очистку старых обработчиков и повторную настройку (`setup_logging`),
 * добавление только своих обработчиков (`add_handlers`),
 * настройку уровней и формата отдельно для консоли и файла,
-* создание файлового обработчика с ротацией (RotatingFileHandler).
+* создание файлового обработчика с ротацией (BufferedRotatingFileHandler).
 
 
 Примечания
@@ -25,10 +25,13 @@
 - Если в окружении указан каталог без имени файла, используется имя по умолчанию.
 - При первом запуске файл создаётся в режиме записи, иначе открывается в режиме
 добавления.
+- Файл журнала пишется через буфер. Сброс на диск — при записи уровня WARNING
+и выше, при ротации и при закрытии обработчика.
 """
 
+from functools import lru_cache
 from pathlib import Path
-import logging, multiprocessing
+import codecs, logging, multiprocessing, os
 from logging.handlers import RotatingFileHandler
 from typing import Any
 
@@ -39,6 +42,96 @@ from src.constants import C
 logger = logging.getLogger(__name__)
 
 
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler с буферизованным файлом.
+
+    Записи ниже WARNING копятся в буфере файла, запись WARNING и выше
+    сбрасывает буфер на диск вместе со всеми предыдущими записями.
+    Размер файла для ротации считается в памяти: seek/tell потока перед
+    каждой записью сбрасывали бы буфер.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._flush_now = True
+        self._size = 0  # Размер файла в байтах с учётом записей в буфере
+        self._codec = "utf-8"  # Кодек для подсчёта байтов записи (без BOM)
+        super().__init__(*args, **kwargs)
+
+    def _open(self):
+        stream = open(
+            self.baseFilename,
+            self.mode,
+            buffering=C.FILE_LOG_BUFFER_SIZE,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+        # BOM пишется один раз в начало файла, а не перед каждой записью
+        codec = codecs.lookup(stream.encoding).name
+        self._codec = "utf-8" if codec == "utf-8-sig" else codec
+        # Только что открытый поток пуст: tell не сбрасывает буфер
+        self._size = stream.seek(0, os.SEEK_END)
+        return stream
+
+    def _encoded_size(self, text: str) -> int:
+        """Число байтов, которое text займёт в файле"""
+        size = len(text.encode(self._codec, self.errors or "strict"))
+        # Текстовый поток заменяет "\n" на os.linesep
+        if os.linesep != "\n":
+            size += text.count("\n") * (len(os.linesep) - 1)
+        return size
+
+    def _need_rollover(self, size: int) -> bool:
+        """Нужна ли ротация перед записью size байтов"""
+        if self.maxBytes <= 0 or not self._size:
+            return False
+        if self._size + size < self.maxBytes:
+            return False
+        # Как в RotatingFileHandler: ротируется только обычный файл
+        return not (
+            os.path.exists(self.baseFilename) and not os.path.isfile(self.baseFilename)
+        )
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is None:  # отложенное открытие (delay=True)
+            self.stream = self._open()
+        text = self.format(record) + self.terminator
+        return self._need_rollover(self._encoded_size(text))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Форматирует запись один раз: тот же текст идёт и в подсчёт размера, и в файл"""
+        self._flush_now = record.levelno >= logging.WARNING
+        try:
+            if self.stream is None:  # отложенное открытие (delay=True)
+                self.stream = self._open()
+            text = self.format(record) + self.terminator
+            size = self._encoded_size(text)
+            if self._need_rollover(size):
+                self.doRollover()  # _open обнуляет _size: запись уходит в новый файл
+                if self.stream is None:  # при delay=True doRollover не открывает файл
+                    self.stream = self._open()
+            self.stream.write(text)
+            self._size += size
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        if self._flush_now:
+            super().flush()
+
+    def close(self) -> None:
+        self._flush_now = True
+        super().close()
+
+
+@lru_cache(maxsize=8)
+def _resolve_level(name_upper: str) -> int:
+    """Числовой уровень логирования по имени в верхнем регистре. Неизвестное имя — DEBUG"""
+    return C.CONVERT_LOGGING_NAME_TO_CODE.get(name_upper, logging.DEBUG)
+
+
 class TuneLogger:
     """Класс для настройки логирования: консоль + файл с ротацией.
 
@@ -54,7 +147,7 @@ class TuneLogger:
     Внутренний метод: добавляет обработчики в root-логгер без очистки.
 
 
-    _create_file_handler() -> RotatingFileHandler
+    _create_file_handler() -> BufferedRotatingFileHandler
     Внутренний метод: создаёт файловый обработчик с ротацией.
     Учитывает, является ли путь каталогом или файлом.
 
@@ -105,7 +198,7 @@ class TuneLogger:
         self.console_handler.setFormatter(fmt)
         self.file_handler.setFormatter(fmt)
 
-    def _create_file_handler(self) -> RotatingFileHandler:
+    def _create_file_handler(self) -> BufferedRotatingFileHandler:
         """Создать файловый обработчик с ротацией."""
         # читаем значение пути файла журнала в окружении, если его нет — дефолт — полноценный путь
         path_str = self.variables.get_var(C.FILE_LOG_PATH, C.FILE_LOG_PATH_DEF)
@@ -120,9 +213,13 @@ class TuneLogger:
 
         p.parent.mkdir(parents=True, exist_ok=True)
 
-        mode = "w" if (not p.exists() or p.stat().st_size == 0) else "a"
+        # Один stat: нет файла или он пуст — пишем заново, иначе дописываем
+        try:
+            mode = "w" if p.stat().st_size == 0 else "a"
+        except FileNotFoundError:
+            mode = "w"
 
-        file_handler = RotatingFileHandler(
+        file_handler = BufferedRotatingFileHandler(
             filename=str(p),
             mode=mode,
             maxBytes=C.ROTATING_MAX_BYTES,
@@ -161,7 +258,7 @@ class TuneLogger:
         if not isinstance(name, str):
             name = str(default_name)
 
-        return C.CONVERT_LOGGING_NAME_TO_CODE.get(name.upper(), logging.DEBUG)
+        return _resolve_level(name.upper())
 
     def _set_log_PyQt6(self):
         """Глушение лишних сообщений PyQt6"""
@@ -1,12 +1,24 @@
 import ctypes
+import math
 import time
 from ctypes import wintypes
+from functools import cache
 
 user32 = ctypes.WinDLL("user32", use_last_error=True)
 kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
 
 CF_UNICODETEXT = 13
 GMEM_MOVEABLE = 0x0002
+WCHAR_SIZE = ctypes.sizeof(wintypes.WCHAR)
+
+HWND_MESSAGE = -3  # Родитель окна «только для сообщений»
+WM_CLIPBOARDUPDATE = 0x031D
+QS_ALLINPUT = 0x04FF
+PM_REMOVE = 0x0001
+# Паузы между попытками открыть занятый буфер, с: 0 — только уступить квант.
+# В сумме ≈ 0.13 с
+OPEN_CLIPBOARD_BACKOFF_S = (0.0, 0.001, 0.002, 0.004, 0.008, 0.016, 0.032, 0.064)
+POLL_INTERVAL_MS = 10  # Опрос номера буфера, если подписаться на изменения не удалось
 
 # === prototypes ===
 
@@ -40,28 +52,144 @@ kernel32.GlobalUnlock.restype = wintypes.BOOL
 kernel32.GlobalFree.argtypes = [wintypes.HGLOBAL]
 kernel32.GlobalFree.restype = wintypes.HGLOBAL
 
+kernel32.SwitchToThread.argtypes = []
+kernel32.SwitchToThread.restype = wintypes.BOOL
+
 user32.GetClipboardSequenceNumber.argtypes = []
 user32.GetClipboardSequenceNumber.restype = wintypes.DWORD
 
+user32.CreateWindowExW.argtypes = [
+    wintypes.DWORD,
+    wintypes.LPCWSTR,
+    wintypes.LPCWSTR,
+    wintypes.DWORD,
+    ctypes.c_int,
+    ctypes.c_int,
+    ctypes.c_int,
+    ctypes.c_int,
+    wintypes.HWND,
+    wintypes.HMENU,
+    wintypes.HINSTANCE,
+    wintypes.LPVOID,
+]
+user32.CreateWindowExW.restype = wintypes.HWND
+
+user32.DestroyWindow.argtypes = [wintypes.HWND]
+user32.DestroyWindow.restype = wintypes.BOOL
+
+user32.AddClipboardFormatListener.argtypes = [wintypes.HWND]
+user32.AddClipboardFormatListener.restype = wintypes.BOOL
+
+user32.MsgWaitForMultipleObjects.argtypes = [
+    wintypes.DWORD,
+    ctypes.POINTER(wintypes.HANDLE),
+    wintypes.BOOL,
+    wintypes.DWORD,
+    wintypes.DWORD,
+]
+user32.MsgWaitForMultipleObjects.restype = wintypes.DWORD
+
+user32.PeekMessageW.argtypes = [
+    ctypes.POINTER(wintypes.MSG),
+    wintypes.HWND,
+    wintypes.UINT,
+    wintypes.UINT,
+    wintypes.UINT,
+]
+user32.PeekMessageW.restype = wintypes.BOOL
+
 
 def get_clipboard_sequence_number() -> int:
     return int(user32.GetClipboardSequenceNumber())
 
 
-def _open_clipboard_with_retry(retries: int = 10, delay: float = 0.01) -> None:
-    for _ in range(retries):
+@cache
+def _clipboard_listener() -> int | None:
+    """
+    Окно «только для сообщений», подписанное на WM_CLIPBOARDUPDATE.
+    Создаётся один раз, при первом ожидании, в вызывающем потоке (потоке GUI):
+    сообщения окна приходят в очередь создавшего его потока.
+
+    :return: дескриптор окна или None, если подписаться не удалось
+    """
+    # Предопределённый класс STATIC: своя оконная процедура не нужна,
+    # сообщения выбираются из очереди PeekMessageW
+    hwnd = user32.CreateWindowExW(
+        0, "STATIC", None, 0, 0, 0, 0, 0, HWND_MESSAGE, None, None, None
+    )
+    if not hwnd:
+        return None
+    if not user32.AddClipboardFormatListener(hwnd):
+        user32.DestroyWindow(hwnd)
+        return None
+    return hwnd
+
+
+def wait_for_clipboard_change(seq_before: int, timeout_ms: int) -> bool:
+    """
+    Ждёт, пока номер последовательности буфера обмена станет отличным от
+    seq_before, но не дольше timeout_ms.
+
+    Поток спит в MsgWaitForMultipleObjects и просыпается по приходу сообщения
+    (в том числе WM_CLIPBOARDUPDATE), а не по таймеру опроса. Решение об изменении
+    принимается по номеру последовательности.
+
+    :return: True, если буфер изменился до истечения срока
+    """
+    hwnd = _clipboard_listener()
+    msg = wintypes.MSG()
+    p_msg = ctypes.byref(msg)
+    # Функции цикла — в локальных именах: без поиска атрибутов на каждом шаге
+    sequence_number = user32.GetClipboardSequenceNumber
+    msg_wait = user32.MsgWaitForMultipleObjects
+    peek_message = user32.PeekMessageW
+    perf_counter = time.perf_counter
+    deadline = perf_counter() + timeout_ms / 1000.0
+
+    while sequence_number() == seq_before:
+        remaining_ms = math.ceil((deadline - perf_counter()) * 1000.0)
+        if remaining_ms <= 0:
+            return False
+        if not hwnd:
+            remaining_ms = min(remaining_ms, POLL_INTERVAL_MS)
+
+        msg_wait(0, None, False, remaining_ms, QS_ALLINPUT)
+        if hwnd:
+            # Выбираем только уведомления своего окна; сообщения Qt остаются в очереди
+            while peek_message(
+                p_msg, hwnd, WM_CLIPBOARDUPDATE, WM_CLIPBOARDUPDATE, PM_REMOVE
+            ):
+                pass
+    return True
+
+
+def _open_clipboard_with_retry() -> None:
+    """
+    Открывает буфер обмена. Пока его держит другое окно — повторяет попытки
+    с нарастающими паузами OPEN_CLIPBOARD_BACKOFF_S: короткая занятость
+    разрешается за доли миллисекунды, долгая не опрашивается часто.
+
+    :raises OSError: если буфер так и не удалось открыть
+    """
+    for delay in OPEN_CLIPBOARD_BACKOFF_S:
         if user32.OpenClipboard(None):
             return
-        time.sleep(delay)
-    raise ctypes.WinError(ctypes.get_last_error())
+        if delay:
+            time.sleep(delay)
+        else:
+            kernel32.SwitchToThread()  # уступить квант владельцу буфера
+    if not user32.OpenClipboard(None):
+        raise ctypes.WinError(ctypes.get_last_error())
 
 
 def get_clipboard_text() -> str:
+    # Проверка формата не требует открытия буфера: без текста сеанс не нужен.
+    # Если текст исчезнет до открытия, GetClipboardData вернёт NULL
+    if not user32.IsClipboardFormatAvailable(CF_UNICODETEXT):
+        return ""
+
     _open_clipboard_with_retry()
     try:
-        if not user32.IsClipboardFormatAvailable(CF_UNICODETEXT):
-            return ""
-
         handle = user32.GetClipboardData(CF_UNICODETEXT)
         if not handle:
             return ""
@@ -84,10 +212,12 @@ def set_clipboard_text(text: str) -> None:
         if not user32.EmptyClipboard():
             raise ctypes.WinError(ctypes.get_last_error())
 
-        data = ctypes.create_unicode_buffer(text)
-        size = ctypes.sizeof(data)
+        # Длина в кодовых единицах UTF-16: символ вне BMP занимает две
+        units = len(text)
+        if text and max(text) > "\uffff":
+            units += sum(ch > "\uffff" for ch in text)
 
-        handle = kernel32.GlobalAlloc(GMEM_MOVEABLE, size)
+        handle = kernel32.GlobalAlloc(GMEM_MOVEABLE, (units + 1) * WCHAR_SIZE)
         if not handle:
             raise ctypes.WinError(ctypes.get_last_error())
 
@@ -97,7 +227,9 @@ def set_clipboard_text(text: str) -> None:
             raise ctypes.WinError(ctypes.get_last_error())
 
         try:
-            ctypes.memmove(ptr, ctypes.addressof(data), size)
+            # Строка перекодируется сразу в блок HGLOBAL, вместе с завершающим нулём,
+            # без промежуточной копии в bytes или буфере ctypes
+            (ctypes.c_wchar * (units + 1)).from_address(ptr).value = text
         finally:
             kernel32.GlobalUnlock(handle)
 
@@ -3,21 +3,26 @@
 
 Назначение
 ---------
-Обёртка над WinAPI `RegisterHotKey` и фильтр Qt для приёма сообщения `WM_HOTKEY`.
-Позволяет регистрировать глобальные сочетания клавиш и реагировать на них в
-Qt‑приложении через `QAbstractNativeEventFilter`.
+Обёртка над WinAPI `RegisterHotKey` с приёмом сообщения `WM_HOTKEY` в отдельном
+потоке. Позволяет регистрировать глобальные сочетания клавиш и реагировать на
+них в Qt‑приложении через сигнал `HotkeysWin.hotkey`.
 
 Состав
 ------
 - Константы `WM_HOTKEY` и флаги модификаторов `MOD_*`.
-- Функции `register_hotkey` и `unregister_hotkey` для регистрации/снятия горячих клавиш.
 - Вспомогательные функции `LO_WORD`/`HI_WORD` для разборки `lParam`.
-- Класс `HotkeyFilter`, который перехватывает `WM_HOTKEY` и вызывает ваш handler.
+- Класс `HotkeysWin`, который регистрирует горячие клавиши в собственном потоке
+  и передаёт их срабатывания в поток GUI сигналом `hotkey(hk_id, vk, mods)`.
 
 Примечания
 ---------
-- Регистрация с `RegisterHotKey(None, ...)` привязывается к *потоку* GUI.
-- Сообщение `WM_HOTKEY` имеет код 0x0312 и приходит в очередь сообщений процесса.
+- Регистрация с `RegisterHotKey(None, ...)` привязывается к *потоку*, который её
+  выполнил. Поэтому регистрация, приём `WM_HOTKEY` и снятие регистрации
+  выполняются в одном потоке `HotkeysWin`.
+- Сообщение `WM_HOTKEY` имеет код 0x0312 и приходит только в очередь сообщений
+  этого потока. Цикл событий Qt не просматривает ради него каждое сообщение GUI.
+- Сигнал испускается из потока приёма; обработчики, подключённые в потоке GUI,
+  вызываются в нём через очередь событий Qt.
 - В `lParam` младшее слово (LO_WORD) — это модификаторы, старшее (HI_WORD) — VK-код
 """
 
@@ -27,15 +32,60 @@ import ctypes
 from ctypes import wintypes
 from typing import Iterable
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
-from PyQt6.QtCore import QObject, QByteArray
-from PyQt6 import QtCore
-from PyQt6.sip import voidptr
+from PyQt6.QtCore import QObject, pyqtSignal
 
-# Доступ к функциям Windows-библиотеки user32.dll
+from src.constants import C
+
+# Доступ к функциям Windows-библиотек user32.dll и kernel32.dll
 user32 = ctypes.WinDLL("user32", use_last_error=True)
+kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+WM_HOTKEY = 0x0312  # Тип оконного сообщения при срабатывании горячей клавиши
+WM_QUIT = 0x0012  # Завершение цикла сообщений потока
+WM_USER = 0x0400
+PM_NOREMOVE = 0x0000
+
+LPMSG = ctypes.POINTER(wintypes.MSG)
+
+# Прототипы задаются один раз: ctypes не подбирает типы аргументов при каждом вызове
+_RegisterHotKey = user32.RegisterHotKey
+_RegisterHotKey.argtypes = [wintypes.HWND, ctypes.c_int, wintypes.UINT, wintypes.UINT]
+_RegisterHotKey.restype = wintypes.BOOL
+
+_UnregisterHotKey = user32.UnregisterHotKey
+_UnregisterHotKey.argtypes = [wintypes.HWND, ctypes.c_int]
+_UnregisterHotKey.restype = wintypes.BOOL
+
+_GetMessageW = user32.GetMessageW
+_GetMessageW.argtypes = [LPMSG, wintypes.HWND, wintypes.UINT, wintypes.UINT]
+_GetMessageW.restype = wintypes.BOOL
+
+_PeekMessageW = user32.PeekMessageW
+_PeekMessageW.argtypes = [
+    LPMSG,
+    wintypes.HWND,
+    wintypes.UINT,
+    wintypes.UINT,
+    wintypes.UINT,
+]
+_PeekMessageW.restype = wintypes.BOOL
+
+_PostThreadMessageW = user32.PostThreadMessageW
+_PostThreadMessageW.argtypes = [
+    wintypes.DWORD,
+    wintypes.UINT,
+    wintypes.WPARAM,
+    wintypes.LPARAM,
+]
+_PostThreadMessageW.restype = wintypes.BOOL
+
+_GetCurrentThreadId = kernel32.GetCurrentThreadId
+_GetCurrentThreadId.argtypes = []
+_GetCurrentThreadId.restype = wintypes.DWORD
 
 
 def LO_WORD(dword: int) -> int:
@@ -49,12 +99,20 @@ def HI_WORD(dword: int) -> int:
 
 
 class HotkeysWin(QObject):
+    """Глобальные горячие клавиши Windows.
+
+    Сигнал `hotkey(hk_id: int, vk: int, mods: int)` испускается при каждом
+    срабатывании зарегистрированной клавиши.
+    """
+
     # ------------------------------
     # Константы WinAPI
     # ------------------------------
 
     MOD_ALT, MOD_CONTROL, MOD_SHIFT, MOD_WIN, MOD_NOREPEAT = 0x1, 0x2, 0x4, 0x8, 0x4000
 
+    hotkey = pyqtSignal(int, int, int)
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -68,129 +126,114 @@ class HotkeysWin(QObject):
             "norepeat": self.MOD_NOREPEAT,
         }
 
+        self._thread: threading.Thread | None = None
+        self._thread_id = 0
+        self._ready = threading.Event()
+        self._error: BaseException | None = None
+
     def register_global_hotkeys(
         self, keys: set[int], mods: Iterable[str] | str
     ) -> None:
         """
         Регистрирует набор глобальных горячих клавиш.
+        Запускает поток приёма `WM_HOTKEY` и ждёт окончания регистрации в нём.
+        Поток предыдущего вызова останавливается, его клавиши снимаются.
 
         :param keys: Множество виртуальных кодов клавиш (VK_*).
         :param mods: Модификаторы (строка с пробелами или итерируемая коллекция).
-        """
-        mods_list = self._prepare_mods(mods)
-        mask = self.mods_to_mask(mods_list)
-        for reg_id, vk in enumerate(keys, start=1):
-            self._register_hotkey(reg_id, mask, vk)
-            self._reg_ids.append(reg_id)
-
-    def _register_hotkey(self, reg_id: int, mask: int, vk: int) -> None:
-        """
-        Вызывает WinAPI RegisterHotKey для одной клавиши.
-        :param reg_id: Идентификатор регистрации
-        :param mask: битовая маска модификаторов
-        :param vk: виртуальный код клавиши
         :raises OSError: если регистрация не удалась
+        :raises BaseException: любая другая ошибка подготовки в потоке приёма
+            (например, ctypes.ArgumentError из-за неверного кода клавиши)
         """
-        ok = user32.RegisterHotKey(None, reg_id, mask, vk)
-        if not ok:
-            raise ctypes.WinError(ctypes.get_last_error())
-
-    def _prepare_mods(self, mods: Iterable[str] | str) -> list[str]:
-        """
-        Преобразует входные модификаторы в список:
-        - разбивает строку на слова (если передана строка)
-        - удаляет пустые элементы
-        — добавляет "norepeat"
-        - удаляет дубликаты, сохраняя порядок
-        """
-        items = mods.split() if isinstance(mods, str) else list(mods)
-        items = [m.lower().strip() for m in items if m.strip()]
-        items.append("norepeat")
-        return self._unique_preserve_order(items)
-
-    def _unique_preserve_order(self, items: Iterable[str]) -> list[str]:
+        mask = self._mods_to_mask(mods)
+        self.cleanup()
+
+        self._ready.clear()
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._listen, args=(mask, list(keys)), name="HotkeysWin", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+
+        if self._error is not None:
+            error, self._error = self._error, None
+            self._thread.join()
+            self._thread = None
+            raise error
+
+    def _listen(self, mask: int, keys: list[int]) -> None:
         """
-        Возвращает новый список без дубликатов,
-        сохраняя исходный порядок элементов.
+        Тело потока приёма: регистрирует клавиши, выбирает `WM_HOTKEY` из очереди
+        сообщений потока до получения `WM_QUIT` и снимает регистрацию.
+        :param mask: битовая маска модификаторов
+        :param keys: виртуальные коды клавиш
         """
-        already_is: set[str] = set()
-        out: list[str] = []
-        for m in items:
-            if m not in already_is:
-                already_is.add(m)
-                out.append(m)
-        return out
+        msg = wintypes.MSG()
+        reg_ids = self._reg_ids
+        try:
+            # Очередь сообщений потока создаётся при первом обращении к ней
+            _PeekMessageW(ctypes.byref(msg), None, WM_USER, WM_USER, PM_NOREMOVE)
+            self._thread_id = _GetCurrentThreadId()
+
+            # Идентификаторы 1..len(keys); в _reg_ids — только успешные регистрации
+            for reg_id, vk in enumerate(keys, start=1):
+                if not _RegisterHotKey(None, reg_id, mask, vk):
+                    raise ctypes.WinError(ctypes.get_last_error())
+                reg_ids.append(reg_id)
+        except BaseException as e:
+            # Любая ошибка подготовки передаётся ждущему потоку GUI
+            self._error = e
+        finally:
+            # Поток GUI ждёт _ready: он должен проснуться при любом исходе
+            self._ready.set()
 
-    def cleanup(self) -> None:
-        """Освобождает ресурсы перед завершением приложения"""
+        try:
+            if self._error is None:
+                # Фильтр пропускает только WM_HOTKEY; WM_QUIT GetMessageW выбирает всегда
+                p_msg = ctypes.byref(msg)
+                emit = self.hotkey.emit
+                while _GetMessageW(p_msg, None, WM_HOTKEY, WM_HOTKEY) > 0:
+                    # HI_WORD/LO_WORD без вызова функций: VK и модификаторы
+                    lp = msg.lParam
+                    emit(msg.wParam, (lp >> 16) & 0xFFFF, lp & 0xFFFF)
+        finally:
+            self._unregister_hotkeys()
+
+    def _unregister_hotkeys(self) -> None:
+        """Снимает регистрацию горячих клавиш. Вызывается в потоке приёма"""
         for hk_id in self._reg_ids:
-            ok = user32.UnregisterHotKey(None, hk_id)
+            ok = _UnregisterHotKey(None, hk_id)
             if not ok:
-                raise ctypes.WinError(ctypes.get_last_error())
+                e = ctypes.WinError(ctypes.get_last_error())
+                logger.error(C.TEXT_ERROR_UNREGISTER_HOTKEY.format(e=e))
 
         self._reg_ids.clear()
 
-    def mods_to_mask(self, mods_str: Iterable[str]) -> int:
+    def cleanup(self) -> None:
+        """Освобождает ресурсы перед завершением приложения: останавливает поток приёма"""
+        if self._thread is None:
+            return
+
+        _PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        self._thread.join()
+        self._thread = None
+
+    def _mods_to_mask(self, mods: Iterable[str] | str) -> int:
         """
-        Собирает модификаторы в маску
-        :param mods_str: Iterable[str] - список модификаторов
+        Собирает модификаторы в маску за один проход:
+        - разбивает строку на слова (если передана строка)
+        - пропускает пустые элементы, регистр не учитывается
+        - добавляет "norepeat"
+        Повторы не мешают: бит, выставленный дважды, остаётся тем же.
+        :param mods: модификаторы (строка с пробелами или итерируемая коллекция)
         :return: int - маска
+        :raises KeyError: если модификатор неизвестен
         """
-        mask = 0
-        for mod_str in mods_str:
-            mask |= self.str_to_mod[mod_str]
+        items = mods.split() if isinstance(mods, str) else mods
+        mask = self.MOD_NOREPEAT
+        for m in items:
+            if m := m.strip():
+                mask |= self.str_to_mod[m.lower()]
 
         return mask
-
-
-class HotkeyFilter(QtCore.QAbstractNativeEventFilter):
-    """Фильтр Qt, вызывающий обработчик при получении `WM_HOTKEY`.
-
-    Обработчик должен иметь сигнатуру `handler(hk_id: int, vk: int, mods: int)` —
-    именно в таком порядке параметры формируются в этом модуле.
-    """
-
-    WM_HOTKEY = 0x0312  # Тип оконного сообщения при срабатывании горячей клавиши
-
-    def __init__(self, handler):
-        super().__init__()
-
-        self.handler = handler
-
-    def nativeEventFilter(
-        self,
-        _eventType: (
-            QByteArray | bytes | bytearray | memoryview
-        ),  # расширенный тип, как у базового,
-        message: voidptr | None,
-    ) -> tuple[bool, voidptr]:
-        """Перехватывает нативные события и отбирает только `WM_HOTKEY`.
-
-        Параметры
-        ---------
-        _eventType : Any
-            Тип нативного события (на Windows — строка вида "windows_*", не используется)
-        message : int
-            Указатель на структуру `MSG` WinAPI, приводится через `from_address`
-
-        Возврат
-        -------
-        tuple[bool, int]
-            `(True, voidptr(0))`, если событие не должно идти дальше, иначе `(False, voidptr(0))`.
-        """
-        if message is None:
-            return False, voidptr(0)
-
-        msg = wintypes.MSG.from_address(int(message))  # type: ignore[arg-type]
-        if msg.message != self.WM_HOTKEY:
-            return False, voidptr(0)
-
-        hk_id = msg.wParam
-        vk = HI_WORD(msg.lParam)  # VK
-        mods = LO_WORD(msg.lParam)  # MOD_*
-        try:
-            self.handler(hk_id, vk, mods)
-        except Exception:
-            # Гасим исключения обработчика, чтобы не ломать цикл Qt
-            logger.exception("Ошибка обработки глобальной горячей клавиши")
-        return True, voidptr(0)
@@ -48,3 +48,10 @@ def test_swap_keyboard_register_is_reversible_for_regular_letters() -> None:
     assert (
         replacer.swap_keyboard_register(replacer.swap_keyboard_register(text)) == text
     )
+
+
+def test_swap_keyboard_register_returns_unmapped_text_as_is() -> None:
+    replacer = ReplaceText()
+    text = "123 +- = 🙂"
+
+    assert replacer.swap_keyboard_register(text) is text
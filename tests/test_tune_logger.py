@@ -1,8 +1,9 @@
-import logging
+import logging, os
+from pathlib import Path
 from typing import Any, cast
 
 from src.constants import C
-from src.tune_logger import TuneLogger
+from src.tune_logger import BufferedRotatingFileHandler, TuneLogger
 
 
 class FakeVariables:
@@ -56,3 +57,90 @@ def test_get_log_level_uses_default_when_value_is_not_string() -> None:
     logger = make_logger_with_env({C.CONSOLE_LOG_LEVEL: 123})
 
     assert logger._get_log_level(C.CONSOLE_LOG_LEVEL, "CRITICAL") == logging.CRITICAL
+
+
+def test_buffered_file_handler_flushes_on_warning(tmp_path: Path) -> None:
+    path = tmp_path / "app.log"
+    handler = BufferedRotatingFileHandler(
+        filename=str(path), maxBytes=10_000, backupCount=1, encoding="utf-8"
+    )
+    logger = logging.getLogger("test_buffered_file_handler")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    try:
+        logger.info("first")
+        assert path.read_text(encoding="utf-8") == ""
+
+        logger.warning("second")
+        assert path.read_text(encoding="utf-8") == "first\nsecond\n"
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def test_buffered_file_handler_keeps_info_records_buffered(tmp_path: Path) -> None:
+    path = tmp_path / "app.log"
+    handler = BufferedRotatingFileHandler(
+        filename=str(path), maxBytes=10_000, backupCount=1, encoding="utf-8"
+    )
+    logger = logging.getLogger("test_buffered_file_handler_info")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.info("record %d", i)
+
+        assert path.read_text(encoding="utf-8") == ""
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def test_buffered_file_handler_rolls_over_by_counted_size(tmp_path: Path) -> None:
+    path = tmp_path / "app.log"
+    handler = BufferedRotatingFileHandler(
+        filename=str(path), maxBytes=20, backupCount=1, encoding="utf-8"
+    )
+    logger = logging.getLogger("test_buffered_file_handler_rollover")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    try:
+        for i in range(3):
+            logger.info("record %d", i)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    assert path.with_name("app.log.1").read_text(encoding="utf-8") == (
+        "record 0\nrecord 1\n"
+    )
+    assert path.read_text(encoding="utf-8") == "record 2\n"
+
+
+def test_buffered_file_handler_counts_size_in_bytes(tmp_path: Path) -> None:
+    path = tmp_path / "app.log"
+    record_size = len(("запись 0" + os.linesep).encode("utf-8"))
+    handler = BufferedRotatingFileHandler(
+        filename=str(path),
+        maxBytes=2 * record_size + 1,
+        backupCount=1,
+        encoding="utf-8",
+    )
+    logger = logging.getLogger("test_buffered_file_handler_bytes")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    try:
+        for i in range(3):
+            logger.info("запись %d", i)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    assert path.with_name("app.log.1").read_text(encoding="utf-8") == (
+        "запись 0\nзапись 1\n"
+    )
+    assert path.read_text(encoding="utf-8") == "запись 2\n"
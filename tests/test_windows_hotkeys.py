@@ -1,5 +1,6 @@
 import pytest
 
+import src.windows_hotkeys as windows_hotkeys
 from src.windows_hotkeys import HI_WORD, LO_WORD, HotkeysWin
 
 
@@ -24,36 +25,67 @@ def test_lo_word_and_hi_word_split_hotkey_lparam() -> None:
     assert HI_WORD(lparam) == virtual_key
 
 
-def test_prepare_mods_normalizes_string_and_adds_norepeat() -> None:
+def test_mods_to_mask_normalizes_string_and_adds_norepeat() -> None:
     hotkeys = HotkeysWin()
 
-    assert hotkeys._prepare_mods(" Control  shift control ") == [
-        "control",
-        "shift",
-        "norepeat",
-    ]
+    assert hotkeys._mods_to_mask(" Control  shift control ") == (
+        HotkeysWin.MOD_CONTROL | HotkeysWin.MOD_SHIFT | HotkeysWin.MOD_NOREPEAT
+    )
 
 
-def test_prepare_mods_normalizes_iterable_and_keeps_order() -> None:
+def test_mods_to_mask_accepts_iterable_with_repeats() -> None:
     hotkeys = HotkeysWin()
 
-    assert hotkeys._prepare_mods(["ALT", "control", "alt"]) == [
-        "alt",
-        "control",
-        "norepeat",
-    ]
+    assert hotkeys._mods_to_mask(["ALT", "control", "alt", " "]) == (
+        HotkeysWin.MOD_ALT | HotkeysWin.MOD_CONTROL | HotkeysWin.MOD_NOREPEAT
+    )
 
 
-def test_mods_to_mask_combines_modifiers() -> None:
+def test_mods_to_mask_rejects_unknown_modifier() -> None:
     hotkeys = HotkeysWin()
 
-    assert hotkeys.mods_to_mask(["control", "shift", "norepeat"]) == (
-        HotkeysWin.MOD_CONTROL | HotkeysWin.MOD_SHIFT | HotkeysWin.MOD_NOREPEAT
-    )
+    with pytest.raises(KeyError):
+        hotkeys._mods_to_mask(["control", "unknown"])
 
 
-def test_mods_to_mask_rejects_unknown_modifier() -> None:
+def test_register_global_hotkeys_reraises_non_os_error(monkeypatch) -> None:
+    def fail(*_args: object) -> int:
+        raise TypeError("bad key")
+
+    monkeypatch.setattr(windows_hotkeys, "_RegisterHotKey", fail)
     hotkeys = HotkeysWin()
 
-    with pytest.raises(KeyError):
-        hotkeys.mods_to_mask(["control", "unknown"])
+    with pytest.raises(TypeError):
+        hotkeys.register_global_hotkeys({0x33}, "control")
+
+    assert hotkeys._thread is None
+
+
+def test_register_global_hotkeys_twice_replaces_listener(monkeypatch) -> None:
+    registered: set[int] = set()
+
+    def register(_hwnd: object, reg_id: int, _mask: int, _vk: int) -> int:
+        # Как RegisterHotKey: занятый идентификатор повторно не регистрируется
+        if reg_id in registered:
+            return 0
+        registered.add(reg_id)
+        return 1
+
+    def unregister(_hwnd: object, reg_id: int) -> int:
+        registered.discard(reg_id)
+        return 1
+
+    monkeypatch.setattr(windows_hotkeys, "_RegisterHotKey", register)
+    monkeypatch.setattr(windows_hotkeys, "_UnregisterHotKey", unregister)
+    hotkeys = HotkeysWin()
+    try:
+        hotkeys.register_global_hotkeys({0x33}, "control")
+        first = hotkeys._thread
+        hotkeys.register_global_hotkeys({0x33, 0x34}, "control")
+
+        assert first is not None and not first.is_alive()
+        assert registered == {1, 2}
+    finally:
+        hotkeys.cleanup()
+
+    assert registered == set()